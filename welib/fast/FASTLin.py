@@ -8,10 +8,16 @@ import pickle
 import glob
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from welib.weio.fast_linearization_file import FASTLinearizationFile
 import pandas as pd
 
 
+def _readLinFile(linFilename):
+    """ Read a lin file, returns the file object and its dataframe representation """
+    linfile = FASTLinearizationFile(linFilename)
+    return linfile, linfile.toDataFrame()
+
 class FASTLinPeriodicOP(object):
     """ Class for a set of *.lin files, all assumed to be for the same periodic operating point
     e.g. 
@@ -61,12 +67,14 @@ class FASTLinPeriodicOP(object):
         self.vWS       = []
         self.vPitch    = []
         self.vRotSpeed = []
-        for i, linFilename in enumerate(linFiles):
-            print(linFilename)
+        for linFilename in linFiles:
             if not os.path.exists(linFilename):
                 print('Linearization file missing: ',linFilename)
-            linfile = FASTLinearizationFile(linFilename)
-            df      = linfile.toDataFrame()
+        # The files are independent, they are read in parallel (mostly IO), the rest is done in order
+        with ThreadPoolExecutor(max_workers=max(1, min(16, len(linFiles)))) as ex:
+            linData = list(ex.map(_readLinFile, linFiles))
+        for linFilename, (linfile, df) in zip(linFiles, linData):
+            print(linFilename)
             self.Data.append(linfile)
             #self.A=lin['A']
             #B=linfile['B']
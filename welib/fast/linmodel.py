@@ -9,17 +9,17 @@ import numpy as np
 import pandas as pd
 import copy
 import os
-import matplotlib.pyplot as plt
+import sys
+from types import MappingProxyType
+from functools import lru_cache
 
 # Local
-import welib.weio as weio
-from welib.weio.fast_output_file import writeDataFrame
 
 from welib.fast.tools.lin import * # backward compatibility
-from welib.fast.tools.lin import matToSIunits, renameList, dfToSIunits
+from welib.fast.tools.lin import matToSIunits, renameList, dfToSIunits, labelsToSI
 
 from welib.system.statespacelinear import LinearStateSpace
-from welib.yams.windturbine import FASTWindTurbine
+# NOTE: matplotlib, weio and FASTWindTurbine are imported where needed (see _loadWT), to keep this module light to import
 
 
 DEFAULT_COL_MAP_LIN ={
@@ -161,11 +161,35 @@ DEFAULT_COL_MAP_OF ={
   'Q_B1E1_[m]': 'q_B1Ed1',
 }
 
+# Read-only views (with interned labels), safe to pass around as default arguments
+DEFAULT_COL_MAP_LIN = MappingProxyType({sys.intern(k): sys.intern(v) for k,v in DEFAULT_COL_MAP_LIN.items()})
+DEFAULT_COL_MAP_OF  = MappingProxyType({sys.intern(k): sys.intern(v) for k,v in DEFAULT_COL_MAP_OF.items()})
 
 
-def _loadOFOut(filename, tMax=None, tRange=None, zRef=None):
+@lru_cache(maxsize=32)
+def _loadWT(fstPath, mtime, algo):
+    from welib.yams.windturbine import FASTWindTurbine
+    return FASTWindTurbine(fstPath, algo=algo)
+
+def _cachedWT(fstFilename, algo='OpenFAST'):
+    """ 
+    Return a FASTWindTurbine for a given fst file, parsed only once as long as the file is not modified.
+    A copy of the cached object is returned, such that models can modify it. 
+    The MAP library (ctypes, if any) is not copied.
+    """
+    fstPath = os.path.realpath(fstFilename)
+    WT = _loadWT(fstPath, os.path.getmtime(fstPath), algo)
+    memo = {} if WT.MAP is None else {id(WT.MAP): WT.MAP}
+    return copy.deepcopy(WT, memo)
+
+
+def _loadOFOut(filename, tMax=None, tRange=None, zRef=None, channels=None):
     """ 
     see also welib.yams.model.simulator 
+
+    INPUTS:
+     - tMax: only the time steps before tMax are read
+     - channels: if provided, list of OpenFAST channels to read (e.g. 'RotSpeed' or 'RotSpeed_[rpm]')
     """
     ext = os.path.splitext(filename)[1].lower()
     if ext=='.fst':
@@ -178,16 +202,21 @@ def _loadOFOut(filename, tMax=None, tRange=None, zRef=None):
     else:
         outfile=filename
     print('FASTLinModel: loading OF :', outfile)
-    dfFS = weio.read(outfile).toDataFrame()
-    if tMax is not None:
-        dfFS=dfFS[dfFS['Time_[s]']<tMax]
+    from welib.weio.fast_output_file import FASTOutputFile
+    # NOTE: the time steps after tMax are not read
+    dfFS = FASTOutputFile(outfile, channels=channels, tMax=tMax).toDataFrame()
+    # NOTE: time is monotonically increasing in OpenFAST outputs, we slice instead of masking
     if tRange is not None:
-        dfFS = dfFS[np.logical_and(dfFS['Time_[s]']>=tRange[0],dfFS['Time_[s]']<=tRange[1])]
+        i0 = np.searchsorted(dfFS['Time_[s]'].values, tRange[0], side='left')
+        i1 = np.searchsorted(dfFS['Time_[s]'].values, tRange[1], side='right')
+        dfFS = dfFS.iloc[i0:i1]
     time =dfFS['Time_[s]'].values
     dfFS.reset_index(inplace=True)
 
-    # Remove duplicate
-    dfFS = dfFS.loc[:,~dfFS.columns.duplicated()].copy()
+    # Remove duplicate (no copy if there are none)
+    bDup = dfFS.columns.duplicated()
+    if bDup.any():
+        dfFS = dfFS.loc[:,~bDup].copy()
 
     # --- Convert hydro loads to loads at zref
     #if zRef is not None:
@@ -273,7 +302,7 @@ class FASTLinModel(LinearStateSpace):
 
         if fstFilename is not None:
             print('FASTLinModel: loading WT :',fstFilename)
-            self.WT = FASTWindTurbine(fstFilename, algo='OpenFAST')
+            self.WT = _cachedWT(fstFilename, algo='OpenFAST')
             self.fstFilename     = fstFilename
 
         # Set A, B, C, D to SI units
@@ -307,6 +336,7 @@ class FASTLinModel(LinearStateSpace):
             qopMethod='lin', 
             uopMethod='zero', uMethod='zero',
             yopMethod='mean',
+            channels=None,
             **kwargs):
         """ 
         Set simulation input and model based on OpenFAST simulation.
@@ -314,13 +344,14 @@ class FASTLinModel(LinearStateSpace):
          - tRange : if provided, limit the time vector to tRange
          - rename: if True, rename out file columns based on colMap or on DEFAULT_COL_MAP_OF
          - inPlace: if True, will potentially reduce the dimension of the A, B, C, D of the current lin model
+         - channels: if provided, only these OpenFAST channels are loaded (all channels are loaded by default)
         """
         # TODO: Harmonize with yams.models.simulator
 
         # --- Load turbine config
         if fstFilename is not None:
             print('FASTLinModel: loading WT :',fstFilename)
-            self.WT_sim = FASTWindTurbine(fstFilename, algo='OpenFAST')
+            self.WT_sim = _cachedWT(fstFilename, algo='OpenFAST')
             self.fstFilename_sim = fstFilename 
         else:
             self.WT_sim = self.WT
@@ -330,21 +361,23 @@ class FASTLinModel(LinearStateSpace):
         #zRef =  -self.p['z_OT'] 
         zRef = - self.WT_sim.twr.pos_global[2]  
         if outFile is None:
-            self.dfFS, self.time = _loadOFOut(self.fstFilename_sim, tRange=tRange, zRef=zRef)
+            self.dfFS, self.time = _loadOFOut(self.fstFilename_sim, tRange=tRange, zRef=zRef, channels=channels)
         else:
-            self.dfFS, self.time = _loadOFOut(outFile, tRange=tRange, zRef=zRef)
+            self.dfFS, self.time = _loadOFOut(outFile, tRange=tRange, zRef=zRef, channels=channels)
 
-        # --- Scale to SI
-        self.dfFS_raw = self.dfFS.copy()
-        self.dfFS = dfToSIunits(self.dfFS, 'dfOF', verbose=False)
-
-        # --- Rename OpenFAST dataframe (inputs/outputs)
+        # --- Scale to SI and rename OpenFAST dataframe (inputs/outputs)
+        # NOTE: labels are processed first, the data is then gathered in one pass over the columns
+        self.dfFS_raw = self.dfFS
+        cols, scales = labelsToSI(self.dfFS_raw.columns, name='dfOF', kind='col', verbose=False)
         if renameFS:
             if colMap is None:
                 colMap = DEFAULT_COL_MAP_OF
-            self.dfFS.columns = renameList(list(self.dfFS.columns), colMap, False)
-            # Remove duplicate
-            self.dfFS = self.dfFS.loc[:,~self.dfFS.columns.duplicated()].copy()
+            cols = renameList(cols, colMap)
+        data = {}
+        for c, scale, (_, v) in zip(cols, scales, self.dfFS_raw.items()):
+            if c not in data: # Remove duplicates, keep first
+                data[c] = v.values*scale if scale!=1 else v.values
+        self.dfFS = pd.DataFrame(data, index=self.dfFS_raw.index)
 
 
         # --- Create a linear model for this simulation
@@ -418,11 +451,13 @@ class FASTLinModel(LinearStateSpace):
 
         # --- Non linear inputs
         nu = len(self.sU)
-        u  = np.zeros((nu,len(self.time)))
         if uMethod=='zero':
+            # Zero for all time, read-only view (no allocation)
+            u = np.broadcast_to(np.zeros((nu,1)), (nu,len(self.time)))
             self._zeroInputs() #uopMethod=uopMethod)
 
         elif uMethod=='DF':
+            u  = np.zeros((nu,len(self.time)))
             for iu, su in enumerate(self.sU):
                 if su not in ['fhx','fhy','fhz','mhx','mhy','mhz']: # NOTE: for hydro, we would double count the stiffness
                     print('>>> Getting input from OpenFAST: ',su)
@@ -451,7 +486,11 @@ class FASTLinModel(LinearStateSpace):
             raise NotImplementedError('uopMethod ',uopMethod)
 
         # This is the "true" inputs for a linear model
-        du = (u.T-self.uop_sim).T
+        if uMethod=='zero':
+            # Constant in time, kept as a view
+            du = np.broadcast_to(-np.asarray(self.uop_sim, dtype=float).reshape((nu,1)), u.shape)
+        else:
+            du = (u.T-self.uop_sim).T
         self.setInputTimeSeries(self.time, du)
 
             #  u[0,:] = dfOF['HydroFzi_[N]'].values - model.WT.mass*model.WT.gravity
@@ -566,7 +605,7 @@ class FASTLinModel(LinearStateSpace):
         else:
             raise NotImplementedError('uopMethod {}'.format(uopMethod))
 
-        u = np.zeros((nu, len(self.time))) # Zero for all time
+        u = np.broadcast_to(np.zeros((nu,1)), (nu, len(self.time))) # Zero for all time, read-only view (no allocation)
 
         # --- Steady State states
         #qop  = None
@@ -648,6 +687,7 @@ class FASTLinModel(LinearStateSpace):
         if out:
             outFile = self.fstFilename_sim.replace('.fst', '{}_FASTLin.outb'.format(prefix))
             print('FASTLinModel: writing {}'.format(outFile))
+            from welib.weio.fast_output_file import writeDataFrame
             writeDataFrame(self.df, outFile)
 
         return self.df
@@ -658,6 +698,7 @@ class FASTLinModel(LinearStateSpace):
         """ 
         NOTE: taken from simulator. TODO harmonization
         """
+        import matplotlib.pyplot as plt
         from welib.tools.colors import python_colors
         from welib.tools.stats import comparison_stats
         # --- Simple Plot
@@ -684,20 +725,27 @@ class FASTLinModel(LinearStateSpace):
             fig.subplots_adjust(left=0.07, right=0.98, top=0.955, bottom=0.05, hspace=0.20, wspace=0.20)
         else:
             fig.subplots_adjust(left=0.07, right=0.98, top=0.955, bottom=0.05, hspace=0.20, wspace=0.33)
+        # Column sets and time vectors, computed once for all axes
+        if dfLI is not None:
+            colsLI = set(dfLI.columns)
+            tLI    = dfLI['Time_[s]'].values
+        if dfFS is not None:
+            colsFS = set(dfFS.columns)
+            tFS    = dfFS['Time_[s]'].values
         for i,ax in enumerate((np.asarray(axes).T).ravel()):
             if i>=len(columns):
                 continue
             t2=None; y2=None
             chan=columns[i]
             if dfLI is not None:
-                if chan in dfLI.columns:
-                    t2=dfLI['Time_[s]']; y2=dfLI[chan]
+                if chan in colsLI:
+                    t2=tLI; y2=dfLI[chan].values
                     ax.plot(t2, y2, '--' , label='linear', c=python_colors(1))
                 else:
                     print('Missing column in Lin: ',chan)
             if dfFS is not None:
-                if chan in dfFS.columns:
-                    t1=dfFS['Time_[s]']; y1=dfFS[chan]
+                if chan in colsFS:
+                    t1=tFS; y1=dfFS[chan].values
                     ax.plot(t1, y1, 'k:' , label='OpenFAST')
                     if t2 is not None:
                         stats2, sStats2 =  comparison_stats(t1, y1, t2, y2, stats='eps,R2', method='mean')
@@ -751,9 +799,12 @@ class FASTLinModel(LinearStateSpace):
 
     def picklable(self):
         """ Make the object picklable..."""
+        # NOTE: the wind turbines may be shared with other models (see _cachedWT), copies are modified
         if self.WT:
+            self.WT = copy.copy(self.WT)
             self.WT.picklable()
         if self.WT_sim:
+            self.WT_sim = copy.copy(self.WT_sim)
             self.WT_sim.picklable()
 #         def noneIfLambda(obj):
 #             if callable(obj) and obj.__name__ == "<lambda>":
@@ -779,11 +830,12 @@ class FASTLinModel(LinearStateSpace):
     def save(self, pickleFile=None):
         if pickleFile is None:
             pickleFile = self.defaultPickleFile
-        # Remove MAP dll (problematic in pickle file)
-        if self.WT.MAP is not None:
-            self.WT.MAP.lib=None
-            self.WT.MAP = None
-        d = {'fstFilename':self.fstFilename, 'WT':self.WT}
+        # Remove MAP dll (problematic in pickle file), on a copy since the WT may be shared (see _cachedWT)
+        WT = self.WT
+        if WT.MAP is not None:
+            WT = copy.copy(WT)
+            WT.MAP = None
+        d = {'fstFilename':self.fstFilename, 'WT':WT}
         LinearStateSpace.save(self, pickleFile, d)
         print('FASTLinModel: writing PKL: ', pickleFile)
         self.pickleFile = pickleFile
@@ -809,6 +861,7 @@ class FASTLinModelFTNSB(FASTLinModel):
 # --------------------------------------------------------------------------------{
 class FASTLinModelTNSB():
     def __init__(self, ED_or_FST_file, StateFile=None, nShapes_twr=1, nShapes_bld=0, DEBUG=False):
+        import welib.weio as weio
 
         # --- Input data from fst and ED file
         ext=os.path.splitext(ED_or_FST_file)[1]
@@ -833,7 +886,7 @@ class FASTLinModelTNSB():
         omega_init = self.ED['RotSpeed']*2*np.pi/60 # rad/s
         psi_init   = self.ED['Azimuth']*np.pi/180 # rad
         FA_init    = self.ED['TTDspFA']
-        iPsi     = list(self.sX).index('psi_rot_[rad]')
+        iPsi     = self.sX.get_loc('psi_rot_[rad]')
         nDOFMech = int(len(self.A)/2)
         q_init   = np.zeros(2*nDOFMech) # x2, state space
 
@@ -848,11 +901,13 @@ class FASTLinModelTNSB():
     def __repr__(self):
         # TODO use printMat from welib.tools.strings
         def pretty_PrintMat(M,fmt='{:11.3e}',fmt_int='    {:4d}   ',sindent='   '):
-            s=sindent
-            for iline,line in enumerate(M):
-                s+=''.join([(fmt.format(v) if int(v)!=v else fmt_int.format(int(v))) for v in line ])
-                s+='\n'+sindent
-            return s
+            fmtv = lambda v: fmt.format(v) if not float(v).is_integer() else fmt_int.format(int(v))
+            s = np.array2string(np.asarray(M), formatter={'float_kind':fmtv, 'int_kind':fmtv}, separator='',
+                    max_line_width=np.inf, threshold=np.inf)
+            # Remove the brackets and the alignment space numpy adds after the first line
+            lines = s.replace('[','').replace(']','').split('\n')
+            lines = lines[:1] + [l[1:] for l in lines[1:]]
+            return sindent + ('\n'+sindent).join(lines) + '\n'+sindent
         s=''
         s+='<FASTLinModel object>\n'
         s+='Attributes:\n'
@@ -907,31 +962,23 @@ def loadLinStateMatModel(StateFile, ScaleUnits=True, Adapt=True, ExtraZeros=Fals
         else:
             (A,B,C,D,M) = dat
 
-    # --- Renaming
-    for S,Mat in zip(['A','B','C','D'],[A,B,C,D]):
-        for irow,row in enumerate(Mat.index.values):
-            # Changing names
-            if row=='SvDGenTq_[kNm]':
-                Mat.index.values[irow]='Qgen_[kNm]'
-                row='Qgen_[kNm]'
-
-
-
-    # --- Scale units
-    if ScaleUnits:
-        # Changing rows
-        for S,Mat in zip(['A','B','C','D'],[A,B,C,D]):
-            Mat = matToSIunits(Mat, name=S, verbose=True)
-    # --- ColMap
-    if nameMap is not None:
-        for S,Mat in zip(['A','B','C','D'],[A,B,C,D]):
-            Mat.rename(nameMap, axis='columns', inplace=True)
-            Mat.rename(nameMap, axis='index', inplace=True)
-
-    # --- Numerics, 0
-    for S,Mat in zip(['A','B','C','D'],[A,B,C,D]):
-        Mat[np.abs(Mat)<1e-14]=0
-
+    # --- Renaming, unit scaling, name mapping and numerical zeros, in one pass per matrix
+    # NOTE: the matrices are handled as numpy arrays and labels, and wrapped as DataFrames at the end
+    def adaptMat(Mat, S):
+        rows = ['Qgen_[kNm]' if r=='SvDGenTq_[kNm]' else r for r in Mat.index]
+        cols = list(Mat.columns)
+        arr  = Mat.to_numpy(dtype=float, copy=True)
+        if ScaleUnits:
+            rows, s_row = labelsToSI(rows, name=S, kind='row', verbose=True)
+            cols, s_col = labelsToSI(cols, name=S, kind='col', verbose=True)
+            arr *= s_row[:,None] # NOTE: for row scaling we multiply
+            arr /= s_col[None,:] # NOTE: for column scaling, we divide!
+        if nameMap is not None:
+            rows = renameList(rows, nameMap)
+            cols = renameList(cols, nameMap)
+        np.putmask(arr, np.abs(arr)<1e-14, 0.0)
+        return arr, rows, cols
+    (A, sXA, sX), (B, sXB, sU), (C, sY, sXC), (D, sYD, sUD) = [adaptMat(Mat, S) for S,Mat in zip(['A','B','C','D'],[A,B,C,D])]
 
     if model=='FNS' and A.shape[0]==6:
         pass
@@ -952,28 +999,30 @@ def loadLinStateMatModel(StateFile, ScaleUnits=True, Adapt=True, ExtraZeros=Fals
         
     elif model=='TNSB' and A.shape[0]==4:
         if Adapt==True:
-            A.iloc[3,:]=0 # No state influence of ddpsi ! <<<< Important
-            A.iloc[2,1]=0 # No psi influence of  ddqt
-            A.iloc[2,3]=0 # No psi_dot influence of ddqt
+            A[3,:]=0 # No state influence of ddpsi ! <<<< Important
+            A[2,1]=0 # No psi influence of  ddqt
+            A[2,3]=0 # No psi_dot influence of ddqt
             if ExtraZeros:
-                B.iloc[0,:]=0 # No thrust influence on dqt
-                B.iloc[1,:]=0 # No thrust influence on dpsi
-            B.iloc[:,2]=0 # no pitch influence on states ! <<<< Important since value may only be valid around a given pitch
+                B[0,:]=0 # No thrust influence on dqt
+                B[1,:]=0 # No thrust influence on dpsi
+            B[:,2]=0 # no pitch influence on states ! <<<< Important since value may only be valid around a given pitch
             if ExtraZeros:
-                B.iloc[2,1]=0 # No Qgen influence on qtdot
-                B.iloc[3,0]=0 # No thrust influence on psi
-                D.iloc[0,1]=0  # No Qgen influence on IMU
-            D.iloc[0,2]=0  # No pitch influences on IMU
+                B[2,1]=0 # No Qgen influence on qtdot
+                B[3,0]=0 # No thrust influence on psi
+                D[0,1]=0  # No Qgen influence on IMU
+            D[0,2]=0  # No pitch influences on IMU
 
-            C.iloc[3,:]=0 # No states influence pitch
-            C.iloc[2,3]=0 # No influence of psi on Qgen !<<< Important
+            C[3,:]=0 # No states influence pitch
+            C[2,3]=0 # No influence of psi on Qgen !<<< Important
     else:
         raise NotImplementedError('Model {} shape {}'.format(model,A.shape))
 
     # ---
-    try:
-        D['Qgen_[Nm]']['Qgen_[Nm]']=1
-    except:
-        pass
+    if 'Qgen_[Nm]' in sYD and 'Qgen_[Nm]' in sUD:
+        D[sYD.index('Qgen_[Nm]'), sUD.index('Qgen_[Nm]')]=1
 
+    A = pd.DataFrame(A, index=sXA, columns=sX)
+    B = pd.DataFrame(B, index=sXB, columns=sU)
+    C = pd.DataFrame(C, index=sY , columns=sXC)
+    D = pd.DataFrame(D, index=sYD, columns=sUD)
     return A,B,C,D,M
@@ -0,0 +1,38 @@
+# --- Common libraries 
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from welib.fast.tools.lin import *
+
+MyDir=os.path.dirname(__file__)
+
+class TestLin(unittest.TestCase):
+
+    def test_matToSIunits(self):
+        # Rows are multiplied by the scaling, columns are divided
+        rows = ['Azimuth_[deg]', 'RotSpeed_[rpm]', 'GenTq_[kNm]', 'TTDspFA_[m]']
+        cols = ['BldPitch_[deg]', 'HubFx_[kN]', 'Time_[s]']
+        M = np.arange(12, dtype=float).reshape(4,3)+1
+        df = pd.DataFrame(M.copy(), index=rows, columns=cols)
+        df2 = matToSIunits(df, name='M')
+        self.assertTrue(df2 is df) # in place
+        s_row = np.array([np.pi/180, np.pi/30, 1000, 1])
+        s_col = np.array([np.pi/180, 1000, 1])
+        np.testing.assert_almost_equal(df.values, M*s_row[:,None]/s_col[None,:])
+        self.assertEqual(list(df.index)  , ['Azimuth_[rad]', 'RotSpeed_[rad/s]', 'GenTq_[Nm]', 'TTDspFA_[m]'])
+        self.assertEqual(list(df.columns), ['BldPitch_[rad]', 'HubFx_[N]', 'Time_[s]'])
+
+    def test_dfToSIunits(self):
+        df = pd.DataFrame(np.ones((2,2)), columns=['Time_[s]','RotSpeed_[rpm]'])
+        df = dfToSIunits(df)
+        np.testing.assert_almost_equal(df['RotSpeed_[rad/s]'].values, [np.pi/30]*2)
+        np.testing.assert_almost_equal(df['Time_[s]'].values, [1,1])
+
+    def test_renameList(self):
+        l = np.array(['a','b','c'])
+        self.assertEqual(renameList(l, {'a':'alpha','c':'gamma'}), ['alpha','b','gamma'])
+
+
+if __name__ == '__main__':
+    unittest.main()
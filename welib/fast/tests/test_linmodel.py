@@ -0,0 +1,26 @@
+# --- Common libraries 
+import os
+import unittest
+import numpy as np
+from welib.fast.linmodel import _cachedWT
+
+MyDir=os.path.dirname(__file__)
+
+class TestLinModel(unittest.TestCase):
+
+    def test_cachedWT(self):
+        # Wind turbines loaded from the same file are independent
+        fstFile = os.path.join(MyDir, '../../../data/Spar/Main_Spar_ED.fst')
+        WT1 = _cachedWT(fstFile)
+        WT2 = _cachedWT(fstFile)
+        self.assertIsNot(WT1, WT2)
+        MM0 = WT2.twr.MM.copy()
+        WT1.twr.MM[0,0] += 1
+        WT1.MAP = 'dummy'
+        np.testing.assert_equal(WT2.twr.MM, MM0)
+        self.assertIsNone(WT2.MAP)
+        np.testing.assert_equal(_cachedWT(fstFile).twr.MM, MM0)
+
+
+if __name__ == '__main__':
+    unittest.main()
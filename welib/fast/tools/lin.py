@@ -3,6 +3,7 @@ Tools to manipulate linear models from OpenFAST lin files
 """
 import numpy as np
 import pandas as pd
+from functools import lru_cache
 
 def unit(s):
     iu=s.rfind('[')
@@ -19,49 +20,66 @@ def no_unit(s):
         return s
 
 def renameList(l, colMap, verbose=False):
-    keys = colMap.keys()
-    for i,s in enumerate(l):
-        if s in keys:
-            l[i] = colMap[s] 
-        else:
-            if verbose:
+    """ Return a new list where the labels present in colMap are renamed """
+    if verbose:
+        for s in l:
+            if s not in colMap:
                 print('Label {} not renamed'.format(s))
-    return l
+    return [colMap.get(s, s) for s in l]
 
 
-def dfToSIunits(Mat, name='', verbose=False):
-    def SIscaling(name):
-        u  = unit(name).lower()
-        nu = no_unit(name)
-        if u in['deg','deg/s','deg/s^2']:
-            scaling = np.pi/180
-            replace = ('deg', 'rad')
-        elif u=='rpm':
-            scaling = 2*np.pi/60
-            replace =  (u, 'rad/s')
-        elif u in ['kn']:
-            scaling = 1000 # to N
-            replace =  (u, 'N')
-        elif u in ['kw']:
-            scaling = 1000 
-            replace = (u, 'W')
-        elif u in ['knm', 'kn-m', 'kn*m']:
-            scaling = 1000 
-            replace = (u, 'Nm')
-        else:
-            return None, None, None
-        newname = nu + '_['+u.replace(replace[0],replace[1])+']'
-        return newname, scaling, replace
-    newCols = list(Mat.columns.values)
-    for icol,col in enumerate(Mat.columns.values):
-        # Scaling based on units
-        newname, scaling, replace = SIscaling(col)
+@lru_cache(maxsize=4096)
+def SIscaling(name):
+    """ 
+    Return the SI label, scaling factor and unit replacement for a label with units, 
+    e.g.: 'Azimuth_[deg]' -> ('Azimuth_[rad]', pi/180, ('deg','rad'))
+    Returns (None, None, None) if the units of the label are already SI (or unknown)
+    NOTE: results are cached, the same labels are typically converted many times
+    """
+    u  = unit(name).lower()
+    nu = no_unit(name)
+    if u in['deg','deg/s','deg/s^2']:
+        scaling = np.pi/180
+        replace = ('deg', 'rad')
+    elif u=='rpm':
+        scaling = np.pi/30
+        replace =  (u, 'rad/s')
+    elif u in ['kn']:
+        scaling = 1000 # to N
+        replace =  (u, 'N')
+    elif u in ['kw']:
+        scaling = 1000 
+        replace = (u, 'W')
+    elif u in ['knm', 'kn-m', 'kn*m']:
+        scaling = 1000 
+        replace = (u, 'Nm')
+    else:
+        return None, None, None
+    newname = nu + '_['+u.replace(replace[0],replace[1])+']'
+    return newname, scaling, replace
+
+def labelsToSI(labels, name='', kind='col', verbose=False):
+    """ 
+    Return the SI labels and the vector of scaling factors for a list of labels.
+    Labels that are already in SI units have a scaling of 1.
+    """
+    newLabels = list(labels)
+    scales    = np.ones(len(newLabels))
+    for i,lab in enumerate(newLabels):
+        newname, scaling, replace = SIscaling(lab)
         if newname is None:
             continue # We skip
-        Mat.iloc[:,icol] *= scaling
-        newCols[icol] = newname
+        scales[i]    = scaling
+        newLabels[i] = newname
         if verbose:
-            print('Mat {} - scaling {} for col {} > {}'.format(name, col, replace, newname))
+            print('Mat {} - scaling {} for {} {} > {}'.format(name, lab, kind, replace, newname))
+    return newLabels, scales
+
+
+def dfToSIunits(Mat, name='', verbose=False):
+    newCols, scales = labelsToSI(Mat.columns.values, name=name, kind='col', verbose=verbose)
+    for icol in np.where(scales!=1)[0]:
+        Mat.iloc[:,icol] *= scales[icol]
     Mat.columns = newCols
     return Mat
 
@@ -72,6 +90,8 @@ def matToSIunits(Mat, name='', verbose=False, row=True, col=True):
     The understanding is that "Columns" are Input and Rows are Outputs
     Because of that, columns are divided by the scaling, rows are multiplied by the scaling
 
+    The matrix is modified in place (and returned). All the scalings are gathered 
+    in a row and a column vector, and applied in one operation.
 
 
         scalings['rpm']    =  (np.pi/30,'rad/s') 
@@ -83,55 +103,18 @@ def matToSIunits(Mat, name='', verbose=False, row=True, col=True):
         scalings['kn*m']   =   (1e3, 'Nm')
 
     """
-
-    def SIscaling(name):
-        u  = unit(name).lower()
-        nu = no_unit(name)
-        if u in['deg','deg/s','deg/s^2']:
-            scaling = np.pi/180
-            replace = ('deg', 'rad')
-        elif u=='rpm':
-            scaling = np.pi/30
-            replace =  (u, 'rad/s')
-        elif u in ['kn']:
-            scaling = 1000 # to N
-            replace =  (u, 'N')
-        elif u in ['kw']:
-            scaling = 1000 
-            replace = (u, 'W')
-        elif u in ['knm', 'kn-m', 'kn*m']:
-            scaling = 1000 
-            replace = (u, 'Nm')
-        else:
-            return None, None, None
-        newname = nu + '_['+u.replace(replace[0],replace[1])+']'
-
-        return newname, scaling, replace
-
-
+    scale = np.ones(Mat.shape)
+    if row:
+        newIndex, s_row = labelsToSI(Mat.index.values, name=name, kind='row', verbose=verbose)
+        scale *= s_row[:,None] # NOTE: for row scaling we multiply
+    if col:
+        newCols, s_col = labelsToSI(Mat.columns.values, name=name, kind='col', verbose=verbose)
+        scale /= s_col[None,:] # NOTE: for column scaling, we divide!
+    if np.any(scale!=1):
+        Mat *= scale
     if row:
-        newIndex = list(Mat.index.values)
-        for irow,row in enumerate(Mat.index.values):
-            # Scaling based on units
-            newname, scaling, replace = SIscaling(row)
-            if newname is None:
-                continue # We skip
-            Mat.iloc[irow,:] *= scaling # NOTE: for row scaling we multiply
-            newIndex[irow] = newname
-            if verbose:
-                print('Mat {} - scaling {} for row {} > {}'.format(name, row, replace, newname))
         Mat.index = newIndex
     if col:
-        newCols = list(Mat.columns.values)
-        for icol,col in enumerate(Mat.columns.values):
-            # Scaling based on units
-            newname, scaling, replace = SIscaling(col)
-            if newname is None:
-                continue # We skip
-            Mat.iloc[:,icol] /= scaling # NOTE: for column scaling, we divide!
-            newCols[icol] = newname
-            if verbose:
-                print('Mat {} - scaling {} for col {} > {}'.format(name, col, replace, newname))
         Mat.columns = newCols
     return Mat
 
@@ -319,8 +319,16 @@ class StateSpace(System):
                 # Store raw data
                 self._inputs_ts = vU
                 self._time_ts   = vTime
-                # Create interpolant for faster evaluation
-                u  = interp1d(vTime, vU)
+                if vU.ndim==2 and vU.shape[1]>1 and vU.strides[1]==0:
+                    # Inputs constant in time (e.g. view from np.broadcast_to): no interpolant (and no copy) needed
+                    u0 = vU[:,0].copy()
+                    def u(t):
+                        if np.ndim(t)==0:
+                            return u0.copy()
+                        return np.repeat(u0[:,None], len(t), axis=1)
+                else:
+                    # Create interpolant for faster evaluation
+                    u  = interp1d(vTime, vU)
                 self.signature_u = 't'
         self._u = u
         if self.verbose:
@@ -9,7 +9,7 @@ from scipy.optimize import OptimizeResult as OdeResultsClass
 from scipy.linalg import expm
 # Local
 from welib.system.statespace import StateSpace
-from welib.fast.tools.lin import matToSIunits, subMat, subSeries # TODO
+from welib.fast.tools.lin import matToSIunits, subMat, subSeries, renameList # TODO
 # --------------------------------------------------------------------------------}
 # --- Simple statespace functions ltiss (linear time invariant state space)
 # --------------------------------------------------------------------------------{
@@ -57,11 +57,17 @@ def integrate(t_eval, q0, A, B, fU, method='LSODA', **options):
      - B: input matrix (nStates x nInputs)
      - fU: function/interpolants interface U=fU(t) or U=fU(t,q)
           U : array of inputs
+          If None, the system has no inputs (or zero inputs), and the term B.u is skipped
 
     OUTPUTS:
      - res: object with attributes `t` and `y`(states for now..) and other attributse from solve_ivp
 
     """
+    if fU is None:
+        odefun = lambda t, q : np.dot(A, q)
+        res = solve_ivp(fun=odefun, t_span=[t_eval[0], t_eval[-1]], y0=q0, t_eval=t_eval, method=method, vectorized=False, **options)   
+        return res
+
     # NOTE: here we allow inputs that are function of states, which is not really a LIT anymore!
     hasq=False
     try:
@@ -290,7 +296,14 @@ class LinearStateSpace(StateSpace):
 
     @property
     def qop_default(self):
-        return pd.Series(np.zeros(len(self.sX)), index=self.sX)
+        """ Zero operating point. Cached (read-only) until sX is reassigned """
+        cache = self.__dict__.get('_qop_default', None)
+        if cache is None or cache[0] is not self.sX:
+            arr = np.zeros(len(self.sX))
+            arr.setflags(write=False)
+            cache = (self.sX, pd.Series(arr, index=self.sX, copy=False))
+            self._qop_default = cache
+        return cache[1]
 
     @property
     def uop(self):
@@ -338,6 +351,8 @@ class LinearStateSpace(StateSpace):
         INPUTS:
          - vTime: 1d array of time steps (do not need to be regular), of length nt
          - vU   : nInputs x nt array of inputs at each time steps
+                  Inputs constant in time can be given as a zero-copy view, e.g.:
+                     np.broadcast_to(u0[:,None], (nInputs, nt))
         """
         vTime = np.asarray(vTime)
         vU    = np.asarray(vU)
@@ -348,6 +363,14 @@ class LinearStateSpace(StateSpace):
         # Call parent class (create interpolant)
         StateSpace.setInputTimeSeries(self, vTime, vU)
 
+    def _zeroInputs_ts(self):
+        """ True if inputs were set as a time series constant in time and equal to zero 
+        (e.g. zero-copy view from np.broadcast_to, see setInputTimeSeries) """
+        U = getattr(self, '_inputs_ts', None)
+        if U is None or U.ndim!=2 or U.shape[1]<=1 or U.strides[1]!=0:
+            return False
+        return not np.any(U[:,0])
+
     # See statespace.py
     #def Inputs(self, t, q=None, qd=None):
 
@@ -415,7 +438,8 @@ class LinearStateSpace(StateSpace):
             res = OdeResultsClass(t=t_eval, y=x) # To mimic result class of solve_ivp
 
         else:
-            res = integrate(t_eval, self.q0_, self.A, self.B, self.Inputs, method=method, **options)
+            fU = None if self._zeroInputs_ts() else self.Inputs
+            res = integrate(t_eval, self.q0_, self.A, self.B, fU, method=method, **options)
 
         # Store
         self.res    = res
@@ -607,19 +631,6 @@ class LinearStateSpace(StateSpace):
     # --------------------------------------------------------------------------------{
     def rename(self, colMap, verbose=False):
         """ Rename labels """
-        sX = list(self.sX)
-        sY = list(self.sY)
-        sU = list(self.sU)
-        keys = list(colMap.keys())
-        def renameList(l, colMap, verbose):
-            for i,s in enumerate(l):
-                if s in keys:
-                    l[i] = colMap[s] 
-                else:
-                    if verbose:
-                        print('Label {} not renamed'.format(s))
-            return l
-
         self.sX = renameList(self.sX, colMap, verbose)
         self.sU = renameList(self.sU, colMap, verbose)
         self.sY = renameList(self.sY, colMap, verbose)
@@ -736,7 +747,8 @@ class LinearStateSpace(StateSpace):
         import pickle
         if not os.path.exists(pickleFile):
             raise Exception('File does not exist: {}'.format(pickleFile))
-        d = pickle.load(open(pickleFile,'rb'))
+        with open(pickleFile,'rb') as f:
+            d = pickle.load(f)
         self.fromDataFrames(d['A'], d['B'], d['C'], d['D'])
         self.setStateInitialConditions(d['q0'].values)
         try:
@@ -753,7 +765,9 @@ class LinearStateSpace(StateSpace):
             extraDict={}
         A, B, C, D = self.toDataFrames()
         extraDict.update({'A':A, 'B':B, 'C':C, 'D':D, 'q0':self.q0, 'qop':self.qop, 'uop':self.uop, 'yop':self.yop})
-        pickle.dump(extraDict, open(pickleFile,'wb'))
+        # Standard pickle file (readable with pickle.load), using the highest protocol (binary, faster than the default one)
+        with open(pickleFile,'wb') as f:
+            pickle.dump(extraDict, f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 
@@ -26,6 +26,62 @@ class Test(unittest.TestCase):
 
         np.testing.assert_almost_equal(e[0], -2.44985, 4)
 
+    def test_polyeig_singular(self):
+        # Singular "mass" matrix, the generalized problem is used, infinite eigenvalues are returned
+        M = np.diag([2.,0.])
+        C = np.array([[0.1, 0], [0, 0.5]])
+        K = np.array([[3., -1], [-1, 2]])
+        X,e = polyeig(K,C,M)
+        bFinite = np.isfinite(e)
+        self.assertEqual(np.sum(bFinite), 3)
+        for s, x in zip(e[bFinite], X[:,bFinite].T):
+            res = (M*s**2 + C*s + K).dot(x)
+            np.testing.assert_almost_equal(np.abs(res), 0, 10)
+
+    def test_polyeig_solver(self):
+        # Reusing the factorization of M gives the same results as polyeig
+        M = np.diag([3.,1.,3.,1.])
+        C = np.array([[0.4 , 0 , -0.3 , 0] , [0 , 0  , 0 , 0] , [-0.3 , 0 , 0.5 , -0.2 ] , [ 0 , 0 , -0.2 , 0.2]])
+        K = np.array([[-7  , 2 , 4    , 0] , [2 , -4 , 2 , 0] , [4    , 2 , -9  , 3    ] , [ 0 , 0 , 3    , -3]])
+        solver = PolyEigSolver(M)
+        for fact in [1, 2]:
+            X1,e1 = polyeig(K*fact, C, M, sort=True, normQ='byMax')
+            X2,e2 = solver.solve(K*fact, C, sort=True, normQ='byMax')
+            np.testing.assert_almost_equal(e1, e2)
+            np.testing.assert_almost_equal(np.abs(X1), np.abs(X2))
+        with self.assertRaises(Exception):
+            PolyEigSolver(np.diag([1.,0.]))
+
+    def test_polyeig_diagonal(self):
+        # Closed form for uncoupled systems matches the generic solution of a rotated system
+        M = np.diag([3.,1.,2.]); C = np.diag([0.4,3.,0.2]); K = np.diag([7.,2.,9.])
+        R,_ = np.linalg.qr(np.array([[1.,2,0],[0,1,3],[1,0,1]]))
+        X1,e1 = polyeig(K, C, M, sort=True)
+        X2,e2 = polyeig(R.T@K@R, R.T@C@R, R.T@M@R, sort=True)
+        np.testing.assert_almost_equal(e1, e2)
+        for j in range(len(e1)):
+            np.testing.assert_almost_equal((K + C*e1[j] + M*e1[j]**2)@X1[:,j], 0)
+        np.testing.assert_almost_equal(polyeig_residuals([K,C,M], X1, e1), 0)
+        np.testing.assert_almost_equal(polyeig_residuals([R.T@K@R, R.T@C@R, R.T@M@R], X2, e2), 0)
+
+    def test_polyeig_batch(self):
+        # Batch results are the same as individual calls, shared matrices are broadcasted
+        M = np.diag([3.,1.,3.,1.])
+        C = np.array([[0.4 , 0 , -0.3 , 0] , [0 , 0  , 0 , 0] , [-0.3 , 0 , 0.5 , -0.2 ] , [ 0 , 0 , -0.2 , 0.2]])
+        K = np.array([[-7  , 2 , 4    , 0] , [2 , -4 , 2 , 0] , [4    , 2 , -9  , 3    ] , [ 0 , 0 , 3    , -3]])
+        facts = [1, 2, 3]
+        res = polyeig_batch(np.array([K*f for f in facts]), C, M, sort=True, normQ='byMax', workers=2)
+        self.assertEqual(len(res), len(facts))
+        for f, (X2, e2) in zip(facts, res):
+            X1, e1 = polyeig(K*f, C, M, sort=True, normQ='byMax')
+            np.testing.assert_almost_equal(e1, e2)
+            np.testing.assert_almost_equal(X1, X2)
+        # Singular leading matrices in threads, the global warning filters are untouched
+        import warnings
+        nFilters = len(warnings.filters)
+        res = polyeig_batch(np.array([K*f for f in range(20)]), C, np.diag([1.,0.,1.,1.]), workers=4)
+        self.assertEqual(len(warnings.filters), nFilters)
+
     def test_eigMCK(self):
         # --- Simple test
         M = np.array([[100.]])
@@ -71,6 +127,38 @@ class Test(unittest.TestCase):
         np.testing.assert_almost_equal(freq_d[0], 0.21054, 4)
         np.testing.assert_almost_equal(zeta[0], 0.35355, 4)
 
+    def test_eigMCK_rayleigh(self):
+        # Rayleigh damping on a coupled system: zeta_i = alpha/(2 omega_i) + beta omega_i/2
+        M = np.array([[2., 0.5], [0.5, 1.]])
+        K = np.array([[6., -2.], [-2., 4.]])
+        alpha, beta = 0.1, 0.02
+        C = alpha*M + beta*K
+        for method in ['diag_beta', 'full_matrix']:
+            freq_d,zeta,Q,freq = eigMCK(M, C, K, method=method)
+            omega = 2*np.pi*freq
+            np.testing.assert_almost_equal(zeta, alpha/(2*omega)+beta*omega/2, 6)
+            # Eigenvalues only
+            freq_d2,zeta2,Q2,freq2 = eigMCK(M, C, K, method=method, eigenvectors=False)
+            self.assertIsNone(Q2)
+            np.testing.assert_almost_equal(freq_d2, freq_d)
+            np.testing.assert_almost_equal(zeta2, zeta)
+
+        # Symmetric solver
+        Q, Lambda = eig(K, M, method='auto')
+        Q2, Lambda2 = eig(K, M)
+        np.testing.assert_almost_equal(np.diag(Lambda), np.diag(Lambda2))
+        np.testing.assert_almost_equal(Q.T.dot(M).dot(Q), np.eye(2))
+        # Same eigenvalues with and without eigenvectors, with and without mass scaling
+        for massScaling in [True, False]:
+            _, Lambda4 = eig(K, M, massScaling=massScaling)
+            _, Lambda5 = eig(K, M, massScaling=massScaling, eigenvectors=False)
+            np.testing.assert_almost_equal(Lambda4, Lambda5)
+            np.testing.assert_almost_equal(np.diag(Lambda4), np.diag(Lambda2))
+        # Small non symmetric matrices are not sent to the symmetric solver
+        K3 = np.array([[6., -2.], [-1., 4.]])*1e-9
+        _, Lambda3 = eig(K3, method='auto')
+        np.testing.assert_allclose(np.diag(Lambda3), np.sort(np.linalg.eigvals(K3).real), rtol=1e-10)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from welib.system.statespacelinear import LinearStateSpace
+
+
+# --------------------------------------------------------------------------------}
+# --- TESTS
+# --------------------------------------------------------------------------------{
+class Test(unittest.TestCase):
+    def get_sys(self, U, time):
+        A = np.array([[0,1],[-4,-0.2]])
+        B = np.array([[0,0],[1,2]])
+        C = np.eye(2)
+        D = np.zeros((2,2))
+        sys = LinearStateSpace(A, B, C, D, sX=['x','dx'], sU=['u1','u2'], sY=['y1','y2'])
+        sys.setStateInitialConditions([1,0])
+        sys.setInputTimeSeries(time, U)
+        return sys
+
+    def test_constant_inputs_view(self):
+        # Inputs constant in time given as a zero-copy view should match a full time series
+        time = np.linspace(0, 5, 101)
+        for u0 in [np.zeros((2,1)), np.array([[0.5],[-1]])]:
+            sys1 = self.get_sys(np.tile(u0, (1,len(time))), time)
+            sys2 = self.get_sys(np.broadcast_to(u0, (2,len(time))), time)
+            self.assertEqual(sys2._zeroInputs_ts(), not np.any(u0))
+            res1, df1 = sys1.integrate(time, calc='u,y')
+            res2, df2 = sys2.integrate(time, calc='u,y')
+            np.testing.assert_almost_equal(res1.y, res2.y, 5)
+            np.testing.assert_almost_equal(df1.values, df2.values, 5)
+
+    def test_save_load(self):
+        import os
+        import tempfile
+        time = np.linspace(0, 1, 11)
+        sys1 = self.get_sys(np.zeros((2,len(time))), time)
+        sys1.qop_ = np.array([0.1,0.2])
+        pklFile = os.path.join(tempfile.gettempdir(), '_test_statespacelinear.pkl')
+        try:
+            sys1.save(pklFile, {'extra':'info'})
+            sys2 = LinearStateSpace()
+            d = sys2.load(pklFile)
+            # The file is a standard pickle file
+            import pickle
+            with open(pklFile, 'rb') as f:
+                np.testing.assert_equal(pickle.load(f)['A'].values, sys1.A)
+        finally:
+            os.remove(pklFile)
+        np.testing.assert_equal(sys2.A, sys1.A)
+        np.testing.assert_equal(sys2.D, sys1.D)
+        np.testing.assert_equal(sys2.qop_, sys1.qop_)
+        self.assertEqual(d['extra'], 'info')
+        sys2.A[0,0] = 1 # loaded arrays are writable
+
+if __name__=='__main__':
+    unittest.main()
@@ -17,11 +17,12 @@ Some definitions:
 
 
 """
+import os
 import pandas as pd    
 import numpy as np
 from scipy import linalg
 
-def polyeig(*A, sort=False, normQ=None):
+def polyeig(*A, sort=False, normQ=None, eigenvectors=True):
     """
     Solve the polynomial eigenvalue problem:
         (A0 + e A1 +...+  e**p Ap)x = 0
@@ -34,6 +35,7 @@ def polyeig(*A, sort=False, normQ=None):
     Most common usage, to solve a second order system: (K + C e + M e**2) x =0
         X,e = polyeig(K,C,M)
 
+    If eigenvectors is False, only the eigenvalues are computed, and X is None (normQ is ignored).
     """
     if len(A)<=0:
         raise Exception('Provide at least one matrix')
@@ -45,19 +47,100 @@ def polyeig(*A, sort=False, normQ=None):
 
     n = A[0].shape[0]
     l = len(A)-1 
-    # Assemble matrices for generalized problem
-    C = np.block([
-        [np.zeros((n*(l-1),n)), np.eye(n*(l-1))],
-        [-np.column_stack( A[0:-1])]
-        ])
-    D = np.block([
-        [np.eye(n*(l-1)), np.zeros((n*(l-1), n))],
-        [np.zeros((n, n*(l-1))), A[-1]          ]
-        ]);
-    # Solve generalized eigenvalue problem
-    e, X = linalg.eig(C, D);
-    if np.all(np.isreal(e)):
-        e=np.real(e)
+    # Uncoupled second order system (diagonal K, C, M): closed form solution of n scalar quadratics
+    if l==2 and all(np.isrealobj(Ai) and _isDiagonal(Ai) for Ai in A) and np.all(np.diagonal(A[2])!=0):
+        k, c, m = [np.diagonal(Ai) for Ai in A]
+        disc = c*c - 4*m*k
+        sq   = np.sqrt(disc) if np.all(disc>=0) else np.sqrt(disc+0j)
+        e    = np.concatenate([(-c + sq)/(2*m), (-c - sq)/(2*m)])
+        X    = None
+        if eigenvectors:
+            # Unit vectors, scaled like the unit eigenvectors [x, e x] of the companion matrix
+            X = np.zeros((n, 2*n), dtype=e.dtype)
+            rows = np.arange(n)
+            X[rows, rows]   = 1/np.sqrt(1+np.abs(e[:n])**2)
+            X[rows, rows+n] = 1/np.sqrt(1+np.abs(e[n:])**2)
+        return _polyeigPost(e, X, n, sort=sort, normQ=normQ)
+
+    # For real matrices with a well conditioned Ap, solve the standard problem on the
+    # companion matrix [[0, I], [-Ap^-1 A0, ..., -Ap^-1 Ap-1]] (real DGEEV instead of QZ)
+    Binv = None
+    if l>=1 and all(np.isrealobj(Ai) for Ai in A):
+        lu = _luFactor(A[-1]) # None if singular or ill-conditioned, using the generalized problem
+        if lu is not None:
+            Binv = linalg.lu_solve(lu, np.column_stack(A[0:-1]), check_finite=False)
+    if Binv is not None:
+        e, X = _companionEig(Binv, n, l, eigenvectors=eigenvectors)
+    else:
+        # Assemble matrices for generalized problem
+        # Companion matrices are preallocated in Fortran order (LAPACK layout) and filled by blocks
+        N   = n*l
+        idx = np.arange(n*(l-1))
+        C = np.zeros((N, N), order='F', dtype=np.result_type(*A))
+        C[idx, idx+n] = 1.0 # super-diagonal identity block
+        for k in range(l):
+            C[n*(l-1):, k*n:(k+1)*n] = -A[k]
+        D = np.zeros((N, N), order='F', dtype=C.dtype)
+        D[idx, idx] = 1.0
+        D[n*(l-1):, n*(l-1):] = A[-1]
+        # Solve generalized eigenvalue problem
+        e, X = _eig(C, D, eigenvectors=eigenvectors, overwrite=True)
+    return _polyeigPost(e, X, n, sort=sort, normQ=normQ)
+
+
+def _luFactor(A):
+    """ 
+    LU factorization (lu, piv) of A, or None if A is singular or ill-conditioned (rcond<eps).
+    The condition number is estimated with LAPACK (getrf/gecon), the global warning filters
+    are not modified, so that this is thread safe (see polyeig_batch).
+    """
+    A = np.asarray(A)
+    getrf, gecon = linalg.get_lapack_funcs(('getrf', 'gecon'), (A,))
+    lu, piv, info = getrf(A)
+    if info!=0:
+        return None # Exactly singular
+    rcond, info = gecon(lu, np.linalg.norm(A, 1), norm='1')
+    if info!=0 or not rcond>=np.finfo(lu.dtype).eps:
+        return None
+    return lu, piv
+
+
+def _companionEig(Binv, n, l, eigenvectors=True):
+    """ 
+    Eigenvalues and vectors of the companion matrix [[0, I], [-Binv]], 
+    where Binv = Ap^-1 [A0, ..., Ap-1] is of shape n x n*l
+    """
+    N   = n*l
+    idx = np.arange(n*(l-1))
+    C = np.zeros((N, N), order='F', dtype=Binv.dtype)
+    C[idx, idx+n] = 1.0 # super-diagonal identity block
+    C[n*(l-1):, :]  = -Binv
+    return _eig(C, eigenvectors=eigenvectors, overwrite=True)
+
+
+def _eig(K, M=None, eigenvectors=True, overwrite=False):
+    """ 
+    General eigenvalue solver, returns eigenvalues and eigenvectors (or None).
+    The inputs are not checked for finiteness (they must be finite), 
+    and are overwritten if `overwrite` is True (for temporary matrices only).
+    """
+    if eigenvectors:
+        return linalg.eig(K, M, check_finite=False, overwrite_a=overwrite, overwrite_b=overwrite)
+    else:
+        return linalg.eigvals(K, M, check_finite=False, overwrite_a=overwrite), None
+
+
+def _polyeigPost(e, X, n, sort=False, normQ=None):
+    """ Post processing of the eigenvalues and vectors of the companion problem """
+    # Real eigenvalues if the imaginary parts are negligible (infinite eigenvalues are ignored)
+    if np.iscomplexobj(e):
+        bFin   = np.isfinite(e)
+        max_im = np.max(np.abs(e.imag[bFin]), initial=0)
+        max_re = np.max(np.abs(e.real[bFin]), initial=0)
+        if max_im <= 1e-12 * max(max_re, 1.0):
+            e = e.real.copy()
+    if X is None:
+        return None, (np.sort(e) if sort else e)
     X=X[:n,:]
 
     # Sort eigen values
@@ -68,14 +151,193 @@ def polyeig(*A, sort=False, normQ=None):
 
     # Scaling each mode by max
     if normQ=='byMax':
-        X /= np.tile(np.max(np.abs(X),axis=0), (n,1))
+        _normByMax(X, signed=False)
 
     return X, e
 
 
-def eig(K, M=None, freq_out=False, sort=True, normQ=None, discardIm=False, massScaling=True):
+class PolyEigSolver():
+    """ 
+    Polynomial eigenvalue solver for a given leading matrix Ap (e.g. a mass matrix).
+    Ap is factorized once and the factorization is reused for different lower order 
+    matrices (e.g. in parameter sweeps where only the stiffness and damping change).
+
+    Usage:
+        solver = PolyEigSolver(M)
+        X,e = solver.solve(K,C) # same as polyeig(K,C,M)
+    """
+    def __init__(self, Ap):
+        Ap = np.asarray(Ap)
+        if Ap.ndim!=2 or Ap.shape[0] != Ap.shape[1]:
+            raise Exception('Matrix must be square')
+        self._lu = _luFactor(Ap)
+        if self._lu is None:
+            raise Exception('The leading matrix is singular or ill-conditioned, use `polyeig` instead.')
+        self.Ap = Ap
+        self.n  = Ap.shape[0]
+
+    def solve(self, *A, sort=False, normQ=None, eigenvectors=True):
+        """ Solve (A0 + e A1 +...+ e**p Ap)x = 0, for A=(A0, ..., Ap-1). See `polyeig`. """
+        if len(A)<=0:
+            raise Exception('Provide at least one matrix')
+        for Ai in A:
+            if Ai.shape != self.Ap.shape:
+                raise Exception('All matrices must have the same shapes')
+        Binv = linalg.lu_solve(self._lu, np.column_stack(A), check_finite=False)
+        e, X = _companionEig(Binv, self.n, len(A), eigenvectors=eigenvectors)
+        return _polyeigPost(e, X, self.n, sort=sort, normQ=normQ)
+
+
+def polyeig_batch(*A, sort=False, normQ=None, eigenvectors=True, workers=None):
+    """
+    Solve a batch of polynomial eigenvalue problems (e.g. at different operating points). 
+
+    Each Ak is either an array of shape (nBatch x n x n), or a single matrix (n x n) 
+    common to all the problems of the batch (e.g. a constant mass matrix).
+    The problems are independent and solved in parallel threads (LAPACK releases the GIL).
+
+    Returns a list of (X, e), one per problem, see `polyeig`.
+
+    Usage:
+        res = polyeig_batch(K_batch, C_batch, M)
+        X0, e0 = res[0]
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    A = [np.asarray(Ai) for Ai in A]
+    nBatch = [Ai.shape[0] for Ai in A if Ai.ndim==3]
+    if len(nBatch)==0:
+        raise Exception('At least one matrix must be of shape (nBatch x n x n)')
+    if any(nb!=nBatch[0] for nb in nBatch):
+        raise Exception('All batches must have the same length')
+    nBatch = nBatch[0]
+
+    def _one(b):
+        return polyeig(*[Ai[b] if Ai.ndim==3 else Ai for Ai in A], sort=sort, normQ=normQ, eigenvectors=eigenvectors)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, nBatch))
+    if workers==1:
+        return [_one(b) for b in range(nBatch)]
+    # Limiting BLAS threads in each worker to avoid oversubscription (if threadpoolctl is available)
+    try:
+        from threadpoolctl import threadpool_limits
+        limits = threadpool_limits(limits=1)
+    except ImportError:
+        limits = None
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            return list(ex.map(_one, range(nBatch)))
+    finally:
+        if limits is not None:
+            limits.restore_original_limits()
+
+
+def polyeig_residuals(A, X, e):
+    """
+    Residuals of the polynomial eigenvalue problem for all the eigen pairs (X[:,i], e[i]):
+        R[:,i] = (A0 + e_i A1 +...+  e_i**p Ap) X[:,i]
+
+    INPUTS:
+      - A: list of matrices [A0, ..., Ap], e.g. [K, C, M]
+      - X: eigenvectors (n x k), as returned by `polyeig`
+      - e: eigenvalues (k)
+    OUTPUTS:
+      - R: residuals (n x k), one matrix product per Ai
+    """
+    e = np.asarray(e)
+    R = A[0] @ X
+    powers = np.ones(len(e), dtype=e.dtype)
+    for Ai in A[1:]:
+        powers = powers * e
+        R = R + (Ai @ X) * powers[None,:]
+    return R
+
+
+def _normByMax(Q, signed=True):
+    """ 
+    Normalize each column of Q, in place, by its value of maximum amplitude.
+    If signed, the value itself is used (maximum becomes 1), otherwise its amplitude.
+    """
+    if signed:
+        scale = Q[np.abs(Q).argmax(axis=0), np.arange(Q.shape[1])]
+    else:
+        scale = np.abs(Q).max(axis=0)
+    Q /= scale
+    return Q
+
+
+def _isDiagonal(A):
+    return np.count_nonzero(A) == np.count_nonzero(np.diagonal(A))
+
+
+def _isRealSymmetric(A):
+    """ True if A is a real square matrix, symmetric relative to the magnitude of its entries """
+    A = np.asarray(A)
+    if not (np.isrealobj(A) and A.ndim==2 and A.shape[0]==A.shape[1]):
+        return False
+    return np.allclose(A, A.T, rtol=1e-10, atol=1e-12*np.abs(A).max(initial=0))
+
+
+def _eigDiag(K, M=None, massScaling=True, method='eig', eigenvectors=True, driver=None):
+    """ Eigenvectors (or None) and eigenvalues of the problem K q = lambda M q (see `eig`) """
+    Q = None
+    # Symmetric solver driver: divide and conquer for large matrices
+    bLarge = np.shape(K)[0]>=200
+    if M is None and method=='auto' and _isRealSymmetric(K):
+        drv = driver if driver is not None else ('evd' if bLarge else 'ev')
+        if eigenvectors:
+            D,Q = linalg.eigh(K, driver=drv, check_finite=False)
+        else:
+            D = linalg.eigvalsh(K, driver=drv, check_finite=False)
+        return Q, D
+    if M is not None:
+        D = None
+        if method=='auto' and (massScaling or not eigenvectors) and _isRealSymmetric(K) and _isRealSymmetric(M):
+            drv = driver if driver is not None else ('gvd' if bLarge else 'gv')
+            try:
+                # Eigenvectors are returned mass normalized (q^T M q = 1), and Q^T K Q = diag(D)
+                if eigenvectors:
+                    D,Q = linalg.eigh(K, M, driver=drv, check_finite=False)
+                else:
+                    D = linalg.eigvalsh(K, M, driver=drv, check_finite=False)
+                lambdaDiag = D
+            except linalg.LinAlgError:
+                D = None # M not positive definite, using the general solver
+        if D is None:
+            D, Q = _eig(K, M, eigenvectors=eigenvectors)
+            if np.all(np.imag(D)==0):
+                D = np.real(D) # NOTE: consistent with Q^T K Q below
+            lambdaDiag = D
+            # --- rescaling using mass matrix to be consistent with Matlab
+            # TODO, this can be made smarter
+            # TODO this should be a normQ
+            if Q is not None and massScaling:
+                modalmass = np.einsum('ij,ij->j', Q, M.dot(Q)) # q_j^T M q_j for all j
+                Q /= np.sqrt(modalmass)
+                lambdaDiag = np.einsum('ij,ij->j', Q, K.dot(Q)) # diagonal of Q^T K Q (=eigenvalues)
+    else:
+        D,Q = _eig(K, eigenvectors=eigenvectors)
+        lambdaDiag = D
+
+    return Q, lambdaDiag
+
+
+def eig(K, M=None, freq_out=False, sort=True, normQ=None, discardIm=False, massScaling=True, method='eig', eigenvectors=True, driver=None):
     """ performs eigenvalue analysis and return same values as matlab 
 
+    method: 'eig' : general solver (default)
+            'auto': use the symmetric solver (eigh) if K (and M) are real symmetric 
+                    (and M positive definite), the general solver otherwise.
+                    Eigenvalues are then sorted, and modes are mass normalized
+    driver: LAPACK driver for the symmetric solver (see scipy.linalg.eigh). 
+            Default: divide and conquer ('evd'/'gvd') for n>=200, 'ev'/'gv' otherwise
+    eigenvectors: if False, only the eigenvalues are computed, Q is None (normQ is ignored)
+    massScaling: if True, modes are mass normalized (q^T M q = 1). 
+            Lambda contains the eigenvalues in all cases.
+
+    NOTE: K and M are not checked for finiteness, they must be finite.
+
     returns:
        Q     : matrix of column eigenvectors
        Lambda: matrix where diagonal values are eigenvalues
@@ -83,39 +345,25 @@ def eig(K, M=None, freq_out=False, sort=True, normQ=None, discardIm=False, massS
          or
     frequencies (if freq_out is True)
     """
-    if M is not None:
-        D,Q = linalg.eig(K,M)
-        # --- rescaling using mass matrix to be consistent with Matlab
-        # TODO, this can be made smarter
-        # TODO this should be a normQ
-        if massScaling:
-            for j in range(M.shape[1]):
-                q_j = Q[:,j]
-                modalmass_j = np.dot(q_j.T,M).dot(q_j)
-                Q[:,j]= Q[:,j]/np.sqrt(modalmass_j)
-        Lambda=np.dot(Q.T,K).dot(Q)
-    else:
-        D,Q = linalg.eig(K)
-        Lambda = np.diag(D)
+    Q, lambdaDiag = _eigDiag(K, M, massScaling=massScaling, method=method, eigenvectors=eigenvectors, driver=driver)
 
     # --- Sort
-    lambdaDiag=np.diag(Lambda)
     if sort:
         I = np.argsort(lambdaDiag)
-        Q          = Q[:,I]
         lambdaDiag = lambdaDiag[I]
+        if Q is not None:
+            Q      = Q[:,I]
     if freq_out:
         Lambda = np.sqrt(lambdaDiag)/(2*np.pi) # frequencies [Hz]
     else:
         Lambda = np.diag(lambdaDiag) # enforcing purely diagonal
 
+    if Q is None:
+        return Q, (np.real(Lambda) if discardIm else Lambda)
+
     # --- Renormalize modes if users wants to
     if normQ == 'byMax':
-        for j in range(Q.shape[1]):
-            q_j = Q[:,j]
-            iMax = np.argmax(np.abs(q_j))
-            scale = q_j[iMax] # not using abs to normalize to "1" and not "+/-1"
-            Q[:,j]= Q[:,j]/scale
+        _normByMax(Q, signed=True) # not using abs to normalize to "1" and not "+/-1"
 
     # --- Sanitization, ensure real values
     if discardIm:
@@ -131,7 +379,7 @@ def eig(K, M=None, freq_out=False, sort=True, normQ=None, discardIm=False, massS
     return Q,Lambda
 
 
-def eigA(A, nq=None, nq1=None, fullEV=False, normQ=None, sort=True):
+def eigA(A, nq=None, nq1=None, fullEV=False, normQ=None, sort=True, eigenvectors=True):
     """
     Perform eigenvalue analysis on a "state" matrix A
     where states are assumed to be ordered as {q, q_dot, q1}
@@ -145,6 +393,7 @@ def eigA(A, nq=None, nq1=None, fullEV=False, normQ=None, sort=True):
                 only the part associated with q and q1 are returned
      - normQ: 'byMax': normalize by maximum
               None: do not normalize
+     - eigenvectors: if False, only the eigenvalues are computed and Q is None
     OUPUTS:
      - freq_d: damped frequencies [Hz]
      - zeta  : damping ratios [-]
@@ -163,42 +412,44 @@ def eigA(A, nq=None, nq1=None, fullEV=False, normQ=None, sort=True):
         nq1 = n-2*nq
     if n!=2*nq+nq1 or nq1<0:
         raise Exception('Number of 1st and second order dofs should match the matrix shape (n= 2*nq + nq1')
-    Q, Lambda = eig(A, sort=False)
-    v = np.diag(Lambda)
-
-    if not fullEV:
-        Q=np.delete(Q, slice(nq,2*nq), axis=0)
+    Q, v = _eigDiag(A, eigenvectors=eigenvectors)
 
     # Selecting eigenvalues with positive imaginary part (frequency)
-    Ipos = np.imag(v)>0
-    Q = Q[:,Ipos]
-    v = v[Ipos]
-
-    # Frequencies and damping based on compled eigenvalues
-    omega_0 = np.abs(v)              # natural cylic frequency [rad/s]
-    freq_d  = np.imag(v)/(2*np.pi)   # damped frequency [Hz]
-    zeta    = - np.real(v)/omega_0   # damping ratio
-    freq_0  = omega_0/(2*np.pi)      # natural frequency [Hz]
+    iCols = np.flatnonzero(np.imag(v)>0)
+    v = v[iCols]
 
-    # Sorting
+    # Sorting by natural frequency, the eigenvalues are sorted before computing the frequencies
+    omega_0 = np.hypot(v.real, v.imag) # natural cylic frequency [rad/s]
     if sort:
-        I = np.argsort(freq_0)
-        freq_d = freq_d[I]
-        freq_0 = freq_0[I]
-        zeta   = zeta[I]
-        Q      = Q[:,I]
+        I = np.argsort(omega_0)
+        v       = v[I]
+        omega_0 = omega_0[I]
+        iCols   = iCols[I]
+
+    # Frequencies and damping based on compled eigenvalues
+    inv2pi  = 1.0/(2.0*np.pi)
+    freq_d  = v.imag * inv2pi          # damped frequency [Hz]
+    freq_0  = omega_0 * inv2pi         # natural frequency [Hz]
+    zeta    = np.divide(v.real, omega_0)
+    np.negative(zeta, out=zeta)        # damping ratio
+
+    # Gather the selected rows and (sorted) columns of Q at once
+    if Q is None:
+        pass
+    elif fullEV:
+        Q = Q[:,iCols]
+    else:
+        iRows = np.r_[0:nq, 2*nq:n]
+        Q = Q[np.ix_(iRows, iCols)]
 
     # Normalize Q
-    if normQ=='byMax':
-        for j in range(Q.shape[1]):
-            q_j = Q[:,j]
-            scale = np.max(np.abs(q_j))
-            Q[:,j]= Q[:,j]/scale
+    if normQ=='byMax' and Q is not None:
+        _normByMax(Q, signed=False)
     return freq_d, zeta, Q, freq_0 
 
 
 
-def eigMK(M, K, sort=True, normQ=None, discardIm=False, freq_out=True, massScaling=True):
+def eigMK(M, K, sort=True, normQ=None, discardIm=False, freq_out=True, massScaling=True, eigenvectors=True):
     """ 
     Eigenvalue analysis of a mechanical system
     M, K: mass, and stiffness matrices respectively
@@ -210,21 +461,24 @@ def eigMK(M, K, sort=True, normQ=None, discardIm=False, freq_out=True, massScali
       Q, freq_0 if freq_out
       Q, Lambda otherwise
     """
-    return eig(K, M, sort=sort, normQ=normQ, discardIm=discardIm, freq_out=freq_out, massScaling=massScaling)
+    return eig(K, M, sort=sort, normQ=normQ, discardIm=discardIm, freq_out=freq_out, massScaling=massScaling, eigenvectors=eigenvectors)
 
 
-def eigMCK(M, C, K, method='full_matrix', sort=True, normQ=None): 
+def eigMCK(M, C, K, method='full_matrix', sort=True, normQ=None, solver=None, eigenvectors=True): 
     """
     Eigenvalue analysis of a mechanical system
     M, C, K: mass, damping, and stiffness matrices respectively
 
     NOTE: full_matrix, state_space and state_space_gen should return the same
           when damping is present
+
+    solver: optional PolyEigSolver(M), to reuse the factorization of M (method 'full_matrix')
+    eigenvectors: if False, Q is None, and the eigenvectors are not computed (unless needed by the method)
     """
     if np.linalg.norm(C)<1e-14:
         if method.lower() not in ['state_space', 'state_space_gen']:
             # No damping
-            Q, freq_0 =  eigMK(M, K, sort=sort, freq_out=True, normQ=normQ)
+            Q, freq_0 =  eigMK(M, K, sort=sort, freq_out=True, normQ=normQ, eigenvectors=eigenvectors)
             freq_d = freq_0
             zeta   = freq_0*0
             return freq_d, zeta, Q, freq_0
@@ -234,17 +488,22 @@ def eigMCK(M, C, K, method='full_matrix', sort=True, normQ=None):
 
     if method.lower()=='diag_beta':
         ## using K, M and damping assuming diagonal beta matrix (Rayleigh Damping)
-        Q, Lambda   = eig(K,M, sort=False) # provide scaled EV, important, no sorting here!
-        freq_0      = np.sqrt(np.diag(Lambda))/(2*np.pi)
-        betaMat     = np.dot(Q,C).dot(Q.T)
-        xi          = (np.diag(betaMat)*np.pi/(2*np.pi*freq_0))
-        xi[xi>2*np.pi] = np.NAN
+        Q, lambdaDiag = _eigDiag(K,M, method='auto') # provide mass scaled EV
+        freq_0      = np.sqrt(lambdaDiag)/(2*np.pi)
+        betaDiag    = np.einsum('ji,ji->i', Q, C.dot(Q)) # diagonal of modal damping matrix Q^T C Q
+        xi          = betaDiag*np.pi/(2*np.pi*freq_0)
+        xi          = np.where(xi>2*np.pi, np.nan, xi)
         zeta        = xi/(2*np.pi)
         freq_d      = freq_0*np.sqrt(1-zeta**2)
+        if not eigenvectors:
+            Q = None
 
     elif method.lower()=='full_matrix':
         ## Method 2 - Damping based on K, M and full D matrix
-        Q,v = polyeig(K,C,M, sort=sort, normQ=normQ)
+        if solver is None:
+            Q,v = polyeig(K,C,M, sort=sort, normQ=normQ, eigenvectors=eigenvectors)
+        else:
+            Q,v = solver.solve(K,C, sort=sort, normQ=normQ, eigenvectors=eigenvectors)
         #omega0 = np.abs(e)
         zeta = - np.real(v) / np.abs(v)
         freq_d = np.imag(v) / (2*np.pi)
@@ -252,7 +511,8 @@ def eigMCK(M, C, K, method='full_matrix', sort=True, normQ=None):
         bValid = freq_d > 1e-08
         freq_d = freq_d[bValid]
         zeta   = zeta[bValid]
-        Q      = Q[:,bValid]
+        if Q is not None:
+            Q  = Q[:,bValid]
         # logdec2 = 2*pi*dampratio_sorted./sqrt(1-dampratio_sorted.^2);
 
     elif method.lower()=='state_space':
@@ -262,7 +522,7 @@ def eigMCK(M, C, K, method='full_matrix', sort=True, normQ=None):
         Z = np.zeros((n, n))
         A = np.block([[np.zeros((n, n)), np.eye(n)],
                       [ -Minv@K        , -Minv@C  ]])
-        return eigA(A, normQ=normQ, sort=sort)
+        return eigA(A, normQ=normQ, sort=sort, eigenvectors=eigenvectors)
 
     elif method.lower()=='state_space_gen':
         I = np.eye(n)
@@ -272,10 +532,11 @@ def eigMCK(M, C, K, method='full_matrix', sort=True, normQ=None):
         B = np.block([[I, Z],
                       [Z, M]])
         # solve the generalized eigenvalue problem
-        D, Q = linalg.eig(A, B)
+        D, Q = _eig(A, B, eigenvectors=eigenvectors, overwrite=True)
+        if Q is not None:
+            Q = Q[:n, ::2]
         # Keeping every other states (assuming pairs..)
         v = D[::2]
-        Q = Q[:n, ::2]
 
         # calculate natural frequencies and damping
         omega_0 = np.abs(v)              # natural cyclic frequency [rad/s]
@@ -285,12 +546,12 @@ def eigMCK(M, C, K, method='full_matrix', sort=True, normQ=None):
     else:
         raise NotImplementedError()
 
-    # Sorting
+    # Sorting, one gather for the frequencies and damping
     if sort:
         I = np.argsort(freq_d)
-        freq_d = freq_d[I]
-        zeta   = zeta[I]
-        Q      = Q[:,I]
+        freq_d, zeta = np.stack((freq_d, zeta))[:,I]
+        if Q is not None:
+            Q  = Q[:,I]
     # Undamped frequency 
     freq_0 = freq_d / np.sqrt(1 - zeta**2)
     #xi = 2 * np.pi * zeta # pseudo log-dec
@@ -310,7 +571,7 @@ if __name__=='__main__':
     K[0,0] = 2700000.;
     K[1,1] = 200000000.;
 
-    freq_d, zeta, Q, freq, xi = eigMCK(M,C,K)
+    freq_d, zeta, Q, freq = eigMCK(M,C,K)
     print(freq_d)
     print(Q)
 
@@ -323,9 +584,7 @@ if __name__=='__main__':
     X,e = polyeig(K,C,M)
     print('X:\n',X)
     print('e:\n',e)
-    # Test taht first eigenvector and valur satisfy eigenvalue problem:
-    s = e[0];
-    x = X[:,0];
-    res = (M*s**2 + C*s + K).dot(x) # residuals
+    # Test that the eigenvectors and values satisfy the eigenvalue problem:
+    res = polyeig_residuals([K,C,M], X, e)
     assert(np.all(np.abs(res)<1e-12))
 
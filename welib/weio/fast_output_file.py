@@ -6,7 +6,8 @@ Main content:
 - class FASTOutputFile()
 - data, info = def load_output(filename)
 - data, info = def load_ascii_output(filename)
-- data, info = def load_binary_output(filename, use_buffer=True)
+- data, info = def load_binary_output(filename, use_buffer=True, channels=None, tMax=None)
+- data, info = def select_output(data, info, channels=None, tMax=None)
 - def writeDataFrame(df, filename, binary=True)
 - def writeBinary(fileName, channels, chanNames, chanUnits, fileID=2, descStr='')
 """
@@ -90,7 +91,14 @@ class FASTOutputFile(File):
         # --- Calling (children) function to read
         self._read(**kwargs)
 
-    def _read(self):
+    def _read(self, channels=None, tMax=None):
+        """
+        INPUTS:
+         - channels: list of channels to read, as 'Name' or 'Name_[unit]'. Time is always read.
+                     If None, all channels are read.
+         - tMax: if provided, only the time steps strictly before tMax are read
+        NOTE: for binary files, only the selected channels and time steps are stored in memory.
+        """
         def readline(iLine):
             with open(self.filename) as f:
                 for i, line in enumerate(f):
@@ -105,8 +113,9 @@ class FASTOutputFile(File):
         try:
             if ext in ['.out','.elev','.dbg','.dbg2']:
                 self.data, self.info = load_ascii_output(self.filename)
+                self.data, self.info = select_output(self.data, self.info, channels=channels, tMax=tMax)
             elif ext=='.outb':
-                self.data, self.info = load_binary_output(self.filename)
+                self.data, self.info = load_binary_output(self.filename, channels=channels, tMax=tMax)
                 self['binary']=True
             elif ext=='.elm':
                 F=CSVFile(filename=self.filename, sep=' ', commentLines=[0,2],colNamesLine=1)
@@ -116,6 +125,7 @@ class FASTOutputFile(File):
                 self.info['attribute_names']=self.data.columns.values
             else:
                 self.data, self.info = load_output(self.filename)
+                self.data, self.info = select_output(self.data, self.info, channels=channels, tMax=tMax)
         except MemoryError as e:    
             raise BrokenReaderError('FAST Out File {}: Memory error encountered\n{}'.format(self.filename,e))
         except Exception as e:    
@@ -205,6 +215,29 @@ def load_output(filename):
             return load_binary_output(filename)
     return load_ascii_output(filename)
 
+def channel_indices(names, units, channels):
+    """ Return the indices of `channels` within the channel `names`.
+    `channels` may be given as 'Name' or 'Name_[unit]' (i.e. as the DataFrame columns). """
+    channels = set(channels)
+    if units is None or len(units)!=len(names):
+        units = ['']*len(names)
+    return [i for i,(n,u) in enumerate(zip(names, units)) if n in channels or n+'_['+u.replace('sec','s')+']' in channels]
+
+def select_output(data, info, channels=None, tMax=None):
+    """ Select a subset of channels and time steps (t<tMax) from loaded output data.
+    The first column (Time) is always kept. """
+    if tMax is not None:
+        data = data[:np.searchsorted(data[:,0], tMax, side='left'),:]
+    if channels is not None:
+        names = info['attribute_names']
+        units = info['attribute_units']
+        iCols = [0]+[i+1 for i in channel_indices(names[1:], None if units is None else units[1:], channels)]
+        data = data[:,iCols]
+        info['attribute_names'] = [names[i] for i in iCols]
+        if units is not None:
+            info['attribute_units'] = [units[i] for i in iCols]
+    return data, info
+
 def load_ascii_output(filename):
     with open(filename) as f:
         info = {}
@@ -232,8 +265,12 @@ def load_ascii_output(filename):
         return data, info
 
 
-def load_binary_output(filename, use_buffer=True):
+def load_binary_output(filename, use_buffer=True, channels=None, tMax=None):
     """
+    Read an OpenFAST binary output file.
+    If `channels` is provided, only these channels (and Time) are stored (see `channel_indices`).
+    If `tMax` is provided, only the time steps strictly before tMax are read.
+
     03/09/15: Ported from ReadFASTbinary.m by Mads M Pedersen, DTU Wind
     24/10/18: Low memory/buffered version by E. Branlard, NREL
     18/01/19: New file format for exctended channels, by E. Branlard, NREL
@@ -248,7 +285,13 @@ def load_binary_output(filename, use_buffer=True):
         fmt, nbytes = {'uint8': ('B', 1), 'int16':('h', 2), 'int32':('i', 4), 'float32':('f', 4), 'float64':('d', 8)}[type]
         return struct.unpack(fmt * n, fid.read(nbytes * n))
 
-    def freadRowOrderTableBuffered(fid, n, type_in, nCols, nOff=0, type_out='float64'):
+    def freadArray(fid, n, type):
+        """ Read `n` values of type `type` as a numpy array (possibly shorter if the file ends) """
+        fmt, nbytes = {'uint8': ('B', 1), 'int16':('h', 2), 'int32':('i', 4), 'float32':('f', 4), 'float64':('d', 8)}[type]
+        buf = fid.read(nbytes * n)
+        return np.frombuffer(buf, dtype=fmt, count=len(buf)//nbytes)
+
+    def freadRowOrderTableBuffered(fid, n, type_in, nCols, nOff=0, type_out='float64', iCols=None):
         """ 
         Reads of row-ordered table from a binary file.
 
@@ -259,6 +302,8 @@ def load_binary_output(filename, use_buffer=True):
         `nOff` allows for additional column space at the begining of the storage table.
         Typically, `nOff=1`, provides a column at the beginning to store the time vector.
 
+        `iCols` allows to store only a subset of the columns (indices).
+
         @author E.Branlard, NREL
 
         """
@@ -269,7 +314,8 @@ def load_binary_output(filename, use_buffer=True):
         BufferSize      = nCols * nLinesPerBuffer
         nBuffer         = int(n/BufferSize)
         # Allocation of data
-        data = np.zeros((nLines,nCols+nOff), dtype = type_out)
+        nColsOut = nCols if iCols is None else len(iCols)
+        data = np.zeros((nLines,nColsOut+nOff), dtype = type_out)
         # Reading
         try:
             nIntRead   = 0
@@ -277,9 +323,11 @@ def load_binary_output(filename, use_buffer=True):
             while nIntRead<n:
                 nIntToRead = min(n-nIntRead, BufferSize)
                 nLinesToRead = int(nIntToRead/nCols)
-                Buffer = np.array(struct.unpack(fmt * nIntToRead, fid.read(nbytes * nIntToRead)))
+                Buffer = np.frombuffer(fid.read(nbytes * nIntToRead), dtype=fmt, count=nIntToRead)
                 Buffer = Buffer.reshape(-1,nCols)
-                data[ nLinesRead:(nLinesRead+nLinesToRead),  nOff:(nOff+nCols)  ] = Buffer
+                if iCols is not None:
+                    Buffer = Buffer[:,iCols]
+                data[ nLinesRead:(nLinesRead+nLinesToRead),  nOff:(nOff+nColsOut)  ] = Buffer
                 nLinesRead = nLinesRead + nLinesToRead
                 nIntRead   = nIntRead   + nIntToRead
         except:
@@ -335,49 +383,63 @@ def load_binary_output(filename, use_buffer=True):
         # -------------------------
         #  get the channel time series
         # -------------------------
-
-        nPts = NT * NumOutChans  #;           % number of data points in the file
-
         if FileID == FileFmtID_WithTime:
-            PackedTime = fread(fid, NT, 'int32')  #; % read the time data
+            PackedTime = freadArray(fid, NT, 'int32')  #; % read the time data
             cnt = len(PackedTime)
             if cnt < NT:
                 raise Exception('Could not read entire %s file: read %d of %d time values' % (filename, cnt, NT))
+            time = (PackedTime - TimeOff[0]) / TimeScl[0];
+        else:
+            time = TimeOut1 + TimeIncr * np.arange(NT)
+
+        # --- Subset of time steps and channels
+        if tMax is not None:
+            NT   = int(np.searchsorted(time, tMax, side='left'))
+            time = time[:NT]
+        iCols = None
+        if channels is not None:
+            iCols    = channel_indices(ChanName[1:], ChanUnit[1:], channels)
+            ChanName = [ChanName[0]] + [ChanName[i+1] for i in iCols]
+            ChanUnit = [ChanUnit[0]] + [ChanUnit[i+1] for i in iCols]
+            ColScl   = [ColScl[i] for i in iCols]
+            ColOff   = [ColOff[i] for i in iCols]
+
+        nPts = NT * NumOutChans  #;           % number of data points in the file (or to be read)
 
         if use_buffer:
             # Reading data using buffers, and allowing an offset for time column (nOff=1)
             if FileID == FileFmtID_NoCompressWithoutTime:
-                data = freadRowOrderTableBuffered(fid, nPts, 'float64', NumOutChans, nOff=1, type_out='float64')
+                data = freadRowOrderTableBuffered(fid, nPts, 'float64', NumOutChans, nOff=1, type_out='float64', iCols=iCols)
             else:
-                data = freadRowOrderTableBuffered(fid, nPts, 'int16', NumOutChans, nOff=1, type_out='float64')
+                data = freadRowOrderTableBuffered(fid, nPts, 'int16', NumOutChans, nOff=1, type_out='float64', iCols=iCols)
         else:
             # NOTE: unpacking huge data not possible on 32bit machines
             if FileID == FileFmtID_NoCompressWithoutTime:
-                PackedData = fread(fid, nPts, 'float64')  #; % read the channel data
+                PackedData = freadArray(fid, nPts, 'float64')  #; % read the channel data
             else:
-                PackedData = fread(fid, nPts, 'int16')  #; % read the channel data
+                PackedData = freadArray(fid, nPts, 'int16')  #; % read the channel data
 
             cnt = len(PackedData)
             if cnt < nPts:
                 raise Exception('Could not read entire %s file: read %d of %d values' % (filename, cnt, nPts))
-            data = np.array(PackedData).reshape(NT, NumOutChans)
+            data = PackedData.reshape(NT, NumOutChans)
             del PackedData
-
-    if FileID == FileFmtID_WithTime:
-        time = (np.array(PackedTime) - TimeOff) / TimeScl;
-    else:
-        time = TimeOut1 + TimeIncr * np.arange(NT)
+            if iCols is not None:
+                data = data[:,iCols]
 
     # -------------------------
     #  Scale the packed binary to real data
     # -------------------------
+    ColScl = np.asarray(ColScl, dtype=np.float64).ravel()
+    ColOff = np.asarray(ColOff, dtype=np.float64).ravel()
     if use_buffer:
-        # Scaling Data
-        for iCol in range(NumOutChans):
-            if np.isnan(ColScl[iCol]) and np.isnan(ColOff[iCol]):
-                data[:,iCol+1] = 0 # probably due to a division by zero in Fortran
-            else:
-                data[:,iCol+1] = (data[:,iCol+1] - ColOff[iCol]) / ColScl[iCol]
+        # Scaling Data, in place
+        chans = data[:,1:]
+        chans -= ColOff
+        chans /= ColScl
+        bNaN = np.isnan(ColScl) & np.isnan(ColOff)
+        if bNaN.any():
+            chans[:,bNaN] = 0 # probably due to a division by zero in Fortran
         # Adding time column
         data[:,0] = time
     else:
@@ -1,4 +1,6 @@
+import re
 import numpy as np
+from itertools import compress
 from sympy import Matrix, symbols, simplify, Function, expand_trig, Symbol, diff
 from sympy import cos, sin, transpose, pi
 from sympy import latex, python
@@ -41,6 +43,172 @@ _defaultOpts={
     'orderH':2,  #< order of taylor expansion for H term
     'verbose':False, 
 }
+_defaultKeys = frozenset(_defaultOpts)
+
+# Variables for the 'zero', 'fixed' or 'dynamic' options
+_yawDOF   = {'zero':0, 'fixed':theta_yaw,   'dynamic':q_yaw  }
+_tiltDOF  = {'zero':0, 'fixed':theta_tilt,  'dynamic':q_tilt }
+_pitchDOF = {'zero':0, 'fixed':theta_pitch, 'dynamic':q_pitch}
+_coneDOF  = {'zero':0, 'fixed':theta_cone}
+_psi0     = {'zero':0, 'fixed':psi_0}
+_rh       = {'zero':0, 'fixed':r_hub}
+
+# Model name, e.g.: F2T1RNA, F000101T0N0S1_fnd, R3S0B100 (suffixes are allowed)
+_modelNameRe = re.compile(r'(?:R(?P<rot>\d)|F(?P<fnd>[01]{6}|\d)T(?P<twr>\d))(?P<RNA>RNA)?(?:N(?P<nac>\d))?(?:S(?P<sft>\d))?(?:B(?P<bld>\d+))?')
+
+
+def _create_rotor(opts, bBld, nDOF_bld, bldDOFDir):
+    """ Create the rotor body and the blades (if any), the blades 2..nB are clones of the first one """
+    blds = []
+    if bBld:
+        # Creating a fake "rotor body" with no inertia for convenience
+        rot = YAMSRigidBody('R', rho_G = [0,0,0], J_G=[0,0,0], mass=0)
+        #rot.inertia = (inertia(rot.frame, Jxx_R, JO_R, JO_R), rot.origin)  # defining inertia at orign
+        if nDOF_bld==0:
+            print('>>> Rigid blades')
+            # NOTE: for now we assume the blades to be identical, hence the use of name_for_var
+            B1 = YAMSRigidBody('B1', rho_G = [x_BG ,y_BG, z_BG], name_for_var='B')
+            blds.append(B1)
+            for ib in np.arange(1, opts['nB']):
+                blds.append(B1.clone('B{:d}'.format(ib+1)))
+        else:
+            print('>>> Flexible blades')
+            # NOTE: for now we assume the blades to be identical, hence the use of name_for_var
+
+            # The first blade is created, the other ones are clones of it (same inertial variables)
+            name_for_DOF = 'B' if opts['collectiveBldDOF'] else None # <<< Collective DOF (same name)
+            B1 = YAMSFlexibleBody('B1', nDOF_bld, directions=bldDOFDir, orderMM=opts['orderMM'], orderH=opts['orderH'], predefined_kind='bld-z',
+                    name_for_var='B', name_for_DOF=name_for_DOF)
+            blds.append(B1)
+            for ib in np.arange(1, opts['nB']):
+                blds.append(B1.clone('B{:d}'.format(ib+1), name_for_DOF=name_for_DOF))
+    else:
+        # Rotor
+        rot = YAMSRigidBody('R', rho_G = [0,0,0], J_G=[Jxx_R, JO_R, JO_R], J_at_Origin=True) # defining inertia at origin
+    return rot, blds
+
+
+def _blade_DOFs(blds, opts, nDOF_bld):
+    """ Return the blade DOFs and speeds, collective DOFs are shared by all blades """
+    bldDOFs   = []
+    bldSpeeds = []
+    if nDOF_bld>0: # flexible blades
+        for ib, bld in enumerate(blds[:1] if opts['collectiveBldDOF'] else blds): # collective DOFs are shared
+            bldDOFs   += bld.q
+            bldSpeeds += bld.qd
+    return bldDOFs, bldSpeeds
+
+
+def _connect_blades(rot, blds, opts):
+    """ Rigid connection from the rotating shaft to each blade """
+    pitchDOF  = _pitchDOF[opts['pitch']]
+    coneDOF   = _coneDOF [opts['cone']]
+    psi0      = _psi0    [opts['azimuth_init']]
+    rh        = _rh      [opts['r_hub']]
+    if opts['coneAtRotorCenter']:
+        # Like in OpenFAST we cone at the rotor center
+        x_RB = rh * sin(coneDOF) # NOTE: cone <0 for wind turbines, so x_RB<0 (downstream)
+        z_RB = rh * cos(coneDOF)
+    else:
+        x_RB = 0
+        z_RB = rh
+
+    nB = opts['nB']
+    psi_b = [psi0+ib*2 * pi/nB for ib,_ in enumerate(blds)] # blade default azimuthal position
+    for ib,bld in enumerate(blds): 
+        rot.connectTo(bld, type='Rigid', rel_pos=(x_RB,-z_RB*sin(psi_b[ib]), z_RB*cos(psi_b[ib])), rot_amounts=(psi_b[ib], coneDOF, pitchDOF), rot_order='XYZ')
+
+
+def _get_model_rotor(model_name, opts, nDOF_sft, bBld, nDOF_bld, bldDOFDir):
+    """ 
+    Rotor only model (e.g. R3S1B100): only the reference frame, the rotor and the blades are created.
+    The rotor is connected to the inertial frame, the shaft DOF (if any) is the rotor azimuth.
+    """
+    verbose=opts['verbose']
+
+    # --- Isolated bodies 
+    ref = YAMSInertialBody('E') 
+    rot, blds = _create_rotor(opts, bBld, nDOF_bld, bldDOFDir)
+
+    # --- Body DOFs
+    sftDOFs  =[]
+    sftSpeeds=[]
+    if nDOF_sft==1:
+        sftDOFs   = [q_psi]
+        sftSpeeds = [omega_x_R]
+    elif nDOF_sft!=0:
+        raise Exception('nDOF shaft should be 0 or 1')
+    bldDOFs, bldSpeeds = _blade_DOFs(blds, opts, nDOF_bld)
+
+    coordinates = sftDOFs   + bldDOFs 
+    speeds      = sftSpeeds + bldSpeeds  # Order determine eq order
+    if verbose:
+        print('>>> Coordinates:',coordinates)
+        print('    speeds     :',speeds)
+
+    # --- Connections between bodies
+    if nDOF_sft==0:
+        ref.connectTo(rot, type='Rigid', rel_pos=(0,0,0), rot_amounts=(0,0,0), rot_order='ZYX')
+    else:
+        ref.connectTo(rot, type='Rigid', rel_pos=(0,0,0), rot_amounts=(0,0,q_psi), rot_order='ZYX')
+    _connect_blades(rot, blds, opts)
+
+    bodies = [rot] + blds
+
+    # --- Kinetics
+    body_loads = []
+    g_vect     = -gravity * ref.frame.z
+    if bBld:
+        # Gravity on blades
+        for ib,bld in enumerate(blds):
+            body_loads  += [(bld, (bld.masscenter, bld.mass * g_vect))]  
+        print('>>>> TODO aero/misc loads on blades')
+    else:
+        # Rotor loads, the rotor axis is the inertial x axis
+        T_a  = dynamicsymbols('T_a')
+        M_ax = dynamicsymbols('M_x_a')
+        body_loads  += [(rot, (rot.masscenter, M_R * g_vect))]  
+        if opts['aero_forces']:
+            body_loads  += [(rot, (rot.origin, T_a * rot.frame.x))]
+        if opts['aero_torques']:
+            body_loads  += [(rot, (rot.frame, M_ax*rot.frame.x))]
+    if verbose:
+        print('>>> Loads:')
+        for (b,l) in body_loads:
+            print(b.name, l)
+
+    # --- Kinematic equations 
+    kdeqsSubs =[]
+    if nDOF_sft==1:
+        omega_RN = diff(q_psi, time) * ref.frame.x  # Angular velocity of rotor wrt inertial frame
+        kdeqsSubs+=[ (omega_x_R,  omega_RN.dot(rot.frame.x)) ]  
+    if nDOF_bld>0:
+        for bld in (blds[:1] if opts['collectiveBldDOF'] else blds):
+            kdeqsSubs +=[ (bld.qd[i], bld.qdot[i]) for i,_ in enumerate(bld.q)]; 
+    if verbose:
+        print('>>> kdeqsSubs:', kdeqsSubs)
+
+    # --- Create a YAMS wrapper model
+    model = YAMSModel(name=model_name)
+    model.opts        = opts
+    model.ref         = ref
+    model.bodies      = bodies
+    model.body_loads  = body_loads
+    model.coordinates = coordinates
+    model.speeds      = speeds
+    model.kdeqsSubs   = kdeqsSubs
+    model.fnd=None
+    model.twr=None
+    model.nac=None
+    model.rot=rot
+    model.blds=blds
+    model.g_vect=g_vect
+    model.smallAnglesFnd = [phi_x,phi_y,phi_z]
+    model.smallAnglesTwr = []
+    model.smallAnglesNac = []
+    model.smallAngles    = model.smallAnglesFnd + model.smallAnglesTwr + model.smallAnglesNac
+    model.shapeNormSubs  = []
+    return model
 
 
 def get_model(model_name, **opts):
@@ -53,21 +221,22 @@ def get_model(model_name, **opts):
     
     """
 
-    for k,v in _defaultOpts.items():
-        if k not in opts.keys():
-            opts[k]=v
-    for k,v in opts.items():
-        if k not in _defaultOpts.keys():
-            raise Exception('Key {} not supported for model options.'.format(k))
+    unknown = opts.keys() - _defaultKeys
+    if len(unknown)>0:
+        raise Exception('Key {} not supported for model options.'.format(', '.join(sorted(unknown))))
+    opts = {**_defaultOpts, **opts}
     #print(opts)
     verbose=opts['verbose']
 
     # --------------------------------------------------------------------------------}
     # --- Extract info from model name
     # --------------------------------------------------------------------------------{
+    m = _modelNameRe.match(model_name)
+    if m is None:
+        raise Exception('Model name not supported: {}'.format(model_name))
     # Nicknames
-    bFullRNA   = model_name.find('RNA')==-1
-    bRotorOnly = model_name.find('R')==0
+    bFullRNA   = m.group('RNA') is None
+    bRotorOnly = m.group('rot') is not None
 
     if bRotorOnly and not bFullRNA:
         raise Exception('Cannot have "Rotor" and RNA')
@@ -75,7 +244,7 @@ def get_model(model_name, **opts):
     if bRotorOnly:
         # Rotor only, overriding options
         bFullRNA=True
-        opts['nB']=int(model_name.split('R')[1][0]) 
+        opts['nB']=int(m.group('rot'))
         opts['mergeFndTwr'] = True
         opts['floating'] = False
         opts['yaw' ] = 'zero'
@@ -97,7 +266,7 @@ def get_model(model_name, **opts):
 
     if not bRotorOnly:
         # "Foundation"/substructure
-        sFnd= model_name.split('T')[0][1:] # TODO why not F????
+        sFnd= m.group('fnd')
         if len(sFnd)==1:
             bFndDOFs   = [False]*6
             nDOF_fnd = int(sFnd[0])
@@ -112,19 +281,19 @@ def get_model(model_name, **opts):
 
     if not bRotorOnly:
         # Tower
-        nDOF_twr = int(model_name.split('T')[1][0])
+        nDOF_twr = int(m.group('twr'))
 
     if bFullRNA:
         # Rotor nacelle assembly is made of several bodies and DOFs
-        bNac = model_name.find('N')>0
-        bSft = model_name.find('S')>0
-        bBld = model_name.find('B')>0
+        bNac = m.group('nac') is not None
+        bSft = m.group('sft') is not None
+        bBld = m.group('bld') is not None
         if bNac:
-            nDOF_nac = int(model_name.split('N')[1][0])
+            nDOF_nac = int(m.group('nac'))
         if bSft:
-            nDOF_sft = int(model_name.split('S')[1][0])
+            nDOF_sft = int(m.group('sft'))
         if bBld:
-            sDOF_bld = model_name.split('B')[1]
+            sDOF_bld = m.group('bld')
             if len(sDOF_bld)==1:
                 nDOF_bld_f = int(sDOF_bld[0])
             elif len(sDOF_bld)==3:
@@ -154,6 +323,11 @@ def get_model(model_name, **opts):
         print('Degrees of freedom:')
         print('fnd',','.join(['1' if b else '0' for b in bFndDOFs]), 'twr',nDOF_twr, 'nac',nDOF_nac, 'sft',nDOF_sft, 'nB:{}'.format(opts['nB']), 'bld',nDOF_bld, '({},{},{}) {:s}'.format(nDOF_bld_f,nDOF_bld_e,nDOF_bld_t, ''.join(bldDOFDir)) )
 
+    if bRotorOnly:
+        if nDOF_nac!=0:
+            raise Exception('Rotor only models cannot have nacelle DOFs')
+        return _get_model_rotor(model_name, opts, nDOF_sft, bBld, nDOF_bld, bldDOFDir)
+
     # --------------------------------------------------------------------------------}
     # --- Isolated bodies 
     # --------------------------------------------------------------------------------{
@@ -161,63 +335,33 @@ def get_model(model_name, **opts):
     ref = YAMSInertialBody('E') 
 
     # --- Fnd Floater/Foundation/Substructure
-    fnd = None
-    if not bRotorOnly:
-        # Foundation, floater, always rigid for now
-        if (not opts['floating']) or opts['mergeFndTwr']:
-            fnd = None # the floater is merged with the twr, or we are not floating
-        else:
-            fnd = YAMSRigidBody('F', rho_G = [0,0,z_FG], J_form='diag') 
+    # Foundation, floater, always rigid for now
+    if (not opts['floating']) or opts['mergeFndTwr']:
+        fnd = None # the floater is merged with the twr, or we are not floating
+    else:
+        fnd = YAMSRigidBody('F', rho_G = [0,0,z_FG], J_form='diag') 
     # --- Tower
     twr = None
-    if not bRotorOnly:
-        if nDOF_twr==0:
-            # Ridid tower
-            twr = YAMSRigidBody('T', rho_G = [0,0,z_TG], J_form='diag') 
-        elif nDOF_twr<=4:
-            # Flexible tower
-            twr = YAMSFlexibleBody('T', nDOF_twr, directions=opts['twrDOFDir'], orderMM=opts['orderMM'], orderH=opts['orderH'], predefined_kind='twr-z')
+    if nDOF_twr==0:
+        # Ridid tower
+        twr = YAMSRigidBody('T', rho_G = [0,0,z_TG], J_form='diag') 
+    elif nDOF_twr<=4:
+        # Flexible tower
+        twr = YAMSFlexibleBody('T', nDOF_twr, directions=opts['twrDOFDir'], orderMM=opts['orderMM'], orderH=opts['orderH'], predefined_kind='twr-z')
 
     # --- Nacelle rotor assembly
     blds = []
     rot  = None
     nac  = None
     if bFullRNA:
-        if not bRotorOnly:
-            # Nacelle
-            nac = YAMSRigidBody('N', rho_G = [x_NG ,0, z_NG], J_form='cross') 
+        # Nacelle
+        nac = YAMSRigidBody('N', rho_G = [x_NG ,0, z_NG], J_form='cross') 
 
         # Shaft
         # TODO shaft mass and inertia...
 
         # Individual blades or rotor
-        if bBld:
-            # Creating a fake "rotor body" with no inertia for convenience
-            rot = YAMSRigidBody('R', rho_G = [0,0,0], J_G=[0,0,0], mass=0)
-            #rot.inertia = (inertia(rot.frame, Jxx_R, JO_R, JO_R), rot.origin)  # defining inertia at orign
-            if nDOF_bld==0:
-                print('>>> Rigid blades')
-                # NOTE: for now we assume the blades to be identical, hence the use of name_for_var
-                for ib, b in enumerate(np.arange(opts['nB'])):
-                    B = YAMSRigidBody('B{:d}'.format(ib+1), rho_G = [x_BG ,y_BG, z_BG], name_for_var='B')
-                    blds.append(B)
-            else:
-                print('>>> Flexible blades')
-                # NOTE: for now we assume the blades to be identical, hence the use of name_for_var
-
-                if opts['collectiveBldDOF']:
-                    for ib, b in enumerate(np.arange(opts['nB'])):
-                        B = YAMSFlexibleBody('B{:d}'.format(ib+1), rho_G = [x_BG ,y_BG, z_BG], name_for_var='B', name_for_DOF='B') # <<< Collective DOF (same name)
-                        blds.append(B)
-                else:
-                    for ib, b in enumerate(np.arange(opts['nB'])):
-                        B = YAMSFlexibleBody('B{:d}'.format(ib+1), nDOF_bld, directions=bldDOFDir, orderMM=opts['orderMM'], orderH=opts['orderH'], predefined_kind='bld-z',
-                                name_for_var='B')
-                        blds.append(B)
-        else:
-            # Rotor
-            rot = YAMSRigidBody('R', rho_G = [0,0,0], J_form='diag')
-            rot.inertia = (inertia(rot.frame, Jxx_R, JO_R, JO_R), rot.origin)  # defining inertia at orign
+        rot, blds = _create_rotor(opts, bBld, nDOF_bld, bldDOFDir)
     else:
         # Nacelle
         #nac = YAMSRigidBody('RNA', rho_G = [x_RNAG ,0, z_RNAG], J_diag=True) 
@@ -234,8 +378,8 @@ def get_model(model_name, **opts):
     else:
         fndDOFsAll    = [x, y, z, phi_x,     phi_y,       phi_z]
         fndSpeedsAll  = [xd,yd,zd,omega_x_T,omega_y_T,omega_z_T]
-        fndDOFs    = [dof for active,dof in zip(bFndDOFs,fndDOFsAll)   if active]
-        fndSpeeds  = [dof for active,dof in zip(bFndDOFs,fndSpeedsAll) if active]
+        fndDOFs    = list(compress(fndDOFsAll,   bFndDOFs)) # Active DOFs only
+        fndSpeeds  = list(compress(fndSpeedsAll, bFndDOFs))
     # --- Twr
     twrDOFs   = []
     twrSpeeds = []
@@ -250,8 +394,8 @@ def get_model(model_name, **opts):
     if opts['tiltShaft'] and opts['tilt']=='dynamic':
         raise Exception('Cannot do tiltshaft with tilt dynamic')
 
-    yawDOF  = {'zero':0, 'fixed':theta_yaw,  'dynamic':q_yaw }[opts['yaw']]
-    tiltDOF = {'zero':0, 'fixed':theta_tilt, 'dynamic':q_tilt}[opts['tilt']]
+    yawDOF  = _yawDOF [opts['yaw']]
+    tiltDOF = _tiltDOF[opts['tilt']]
     nacDOFs     = []
     nacSpeeds   = []
     nacKDEqSubs = []
@@ -288,21 +432,7 @@ def get_model(model_name, **opts):
             raise Exception('nDOF shaft should be 0 or 1')
 
     # --- Blade/Rotor
-    bldDOFs=[] 
-    bldSpeeds=[] 
-    if bFullRNA:
-        bldDOFs   = []
-        bldSpeeds = []
-        if nDOF_bld>0: # flexible tower
-            for ib, bld in enumerate(blds): 
-                bldDOFs   += bld.q
-                bldSpeeds += bld.qd
-
-
-    pitchDOF  = {'zero':0, 'fixed':theta_pitch,  'dynamic':q_pitch }[opts['pitch']]
-    coneDOF   = {'zero':0, 'fixed':theta_cone}[opts['cone']]
-    psi0      = {'zero':0, 'fixed':psi_0}[opts['azimuth_init']]
-    rh        = {'zero':0, 'fixed':r_hub}[opts['r_hub']]
+    bldDOFs, bldSpeeds = _blade_DOFs(blds, opts, nDOF_bld)
 
     coordinates = fndDOFs   + twrDOFs   + nacDOFs   + sftDOFs   + bldDOFs 
     speeds      = fndSpeeds + twrSpeeds + nacSpeeds + sftSpeeds + bldSpeeds  # Order determine eq order
@@ -339,82 +469,55 @@ def get_model(model_name, **opts):
             ref.connectTo(twr, type='Free' , rel_pos=rel_pos, rot_amounts=rots, rot_order='XYZ')  #NOTE: rot order is not "optimal".. phi_x should be last
             #ref.connectTo(twr, type='Free' , rel_pos=rel_pos, rot_amounts=(rots[2],rots[1],rots[0]), rot_order='ZYX')  #NOTE: rot order is not "optimal".. phi_x should be last
     else:
-        if not bRotorOnly:
-            #print('Rigid connection ref twr')
-            ref.connectTo(twr, type='Rigid' , rel_pos=(0,0,0))
-
-    if not bRotorOnly:
-        # Rigid connection between twr and fnd if fnd exists
-        if fnd is not None:
-            #print('Rigid connection twr fnd')
-            if nDOF_twr==0:
-                twr.connectTo(fnd, type='Rigid', rel_pos=(0,0,0)) # -L_F
-            else:
-                twr.connectTo(fnd, type='Rigid', rel_pos=(0,0,0)) # -L_F
+        #print('Rigid connection ref twr')
+        ref.connectTo(twr, type='Rigid' , rel_pos=(0,0,0))
 
+    # Rigid connection between twr and fnd if fnd exists
+    if fnd is not None:
+        #print('Rigid connection twr fnd')
         if nDOF_twr==0:
-            # Tower rigid -> Rigid connection to nacelle
-            # TODO TODO L_T or twr.L
-            #if nDOF_nac==0:
-            #print('Rigid connection twr nac')
-            #else:
-            #print('Dynamic connection twr nac')
+            twr.connectTo(fnd, type='Rigid', rel_pos=(0,0,0)) # -L_F
+        else:
+            twr.connectTo(fnd, type='Rigid', rel_pos=(0,0,0)) # -L_F
 
-            if opts['tiltShaft']:
-                # Shaft will be tilted, not nacelle
-                twr.connectTo(nac, type='Rigid', rel_pos=(0,0,L_T)  , rot_amounts=(yawDOF,0,0), rot_order='ZYX')
-            else:
-                # Nacelle is tilted
-                twr.connectTo(nac, type='Rigid', rel_pos=(0,0,L_T)  , rot_amounts=(yawDOF,tiltDOF,0), rot_order='ZYX')
+    if nDOF_twr==0:
+        # Tower rigid -> Rigid connection to nacelle
+        # TODO TODO L_T or twr.L
+        #if nDOF_nac==0:
+        #print('Rigid connection twr nac')
+        #else:
+        #print('Dynamic connection twr nac')
 
+        if opts['tiltShaft']:
+            # Shaft will be tilted, not nacelle
+            twr.connectTo(nac, type='Rigid', rel_pos=(0,0,L_T)  , rot_amounts=(yawDOF,0,0), rot_order='ZYX')
         else:
-            # Flexible tower -> Flexible connection to nacelle
-            #print('Flexible connection twr nac')
-            if opts['tiltShaft']:
-                twr.connectToTip(nac, type='Joint', rel_pos=(0,0,twr.L)  , rot_amounts=(yawDOF, 0      , 0), rot_order='ZYX', rot_type_elastic=opts['rot_elastic_type'], doSubs=opts['rot_elastic_subs'])
-            else:
-                twr.connectToTip(nac, type='Joint', rel_pos=(0,0,twr.L)  , rot_amounts=(yawDOF, tiltDOF, 0), rot_order='ZYX', rot_type_elastic=opts['rot_elastic_type'], doSubs=opts['rot_elastic_subs'])
+            # Nacelle is tilted
+            twr.connectTo(nac, type='Rigid', rel_pos=(0,0,L_T)  , rot_amounts=(yawDOF,tiltDOF,0), rot_order='ZYX')
 
-    # --- Ref to blades
-    if opts['coneAtRotorCenter']:
-        # Like in OpenFAST we cone at the rotor center
-        x_RB = rh * sin(coneDOF) # NOTE: cone <0 for wind turbines, so x_RB<0 (downstream)
-        z_RB = rh * cos(coneDOF)
     else:
-        x_RB = 0
-        z_RB = rh
+        # Flexible tower -> Flexible connection to nacelle
+        #print('Flexible connection twr nac')
+        if opts['tiltShaft']:
+            twr.connectToTip(nac, type='Joint', rel_pos=(0,0,twr.L)  , rot_amounts=(yawDOF, 0      , 0), rot_order='ZYX', rot_type_elastic=opts['rot_elastic_type'], doSubs=opts['rot_elastic_subs'])
+        else:
+            twr.connectToTip(nac, type='Joint', rel_pos=(0,0,twr.L)  , rot_amounts=(yawDOF, tiltDOF, 0), rot_order='ZYX', rot_type_elastic=opts['rot_elastic_type'], doSubs=opts['rot_elastic_subs'])
 
-    nB = opts['nB']
-    psi_b = [psi0+ib*2 * pi/nB for ib,_ in enumerate(blds)] # blade default azimuthal position
-    if not bRotorOnly:
-        # --- Nacelle to rotor/blades
-        if bFullRNA:
-            if opts['tiltShaft']:
-                if nDOF_sft==0:
-                    nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,tiltDOF,0), rot_order='ZYX')
-                else:
-                    nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,tiltDOF,q_psi), rot_order='ZYX')
+    # --- Nacelle to rotor/blades
+    if bFullRNA:
+        if opts['tiltShaft']:
+            if nDOF_sft==0:
+                nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,tiltDOF,0), rot_order='ZYX')
             else:
-                if nDOF_sft==0:
-                    nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,0      ,0), rot_order='ZYX')
-                else:
-                    nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,0      ,q_psi), rot_order='ZYX')
-            if bBld:
-                print('>>> Rigid connection from rotating shaft to each blades')
-                for ib,bld in enumerate(blds): 
-                    rot.connectTo(bld, type='Rigid', rel_pos=(x_RB,-z_RB*sin(psi_b[ib]), z_RB*cos(psi_b[ib])), rot_amounts=(psi_b[ib], coneDOF, pitchDOF), rot_order='XYZ')
-    else:
-
-        # --- Rotor Only
-        if nDOF_sft==0:
-            ref.connectTo(rot, type='Rigid', rel_pos=(0,0,0), rot_amounts=(0,0,0), rot_order='ZYX')
+                nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,tiltDOF,q_psi), rot_order='ZYX')
         else:
-            ref.connectTo(rot, type='Rigid', rel_pos=(0,0,0), rot_amounts=(0,0,q_psi), rot_order='ZYX')
-
-        print('>>> TODO TODO hub radius, and precone')
-        for ib,bld in enumerate(blds): 
-            print('x_RB', x_RB, 'z_RB',z_RB, psi_b[ib])
-            rot.connectTo(bld, type='Rigid', rel_pos=(x_RB, -z_RB*sin(psi_b[ib]), z_RB*cos(psi_b[ib])), rot_amounts=(psi_b[ib], coneDOF, pitchDOF), rot_order='XYZ')
+            if nDOF_sft==0:
+                nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,0      ,0), rot_order='ZYX')
+            else:
+                nac.connectTo(rot, type='Joint', rel_pos=(x_NR,0,z_NR), rot_amounts=(0,0      ,q_psi), rot_order='ZYX')
+        if bBld:
+            print('>>> Rigid connection from rotating shaft to each blades')
+            _connect_blades(rot, blds, opts)
 
     # --------------------------------------------------------------------------------}
     # --- bodies
@@ -439,22 +542,15 @@ def get_model(model_name, **opts):
     # --- Kinetics
     # --------------------------------------------------------------------------------{
     body_loads       = []
-    g_vect           = -gravity * ref.frame.z
+    e_x, e_y, e_z    = ref.frame.x, ref.frame.y, ref.frame.z # Inertial frame vectors, used for all loads
+    g_vect           = -gravity * e_z
     # --- Foundation/floater loads
     if fnd is not None:
-        grav_F = (fnd.masscenter, -fnd.mass * gravity * ref.frame.z)
-        # Point of application for Buoyancy and mooring
-
-        P_O = twr.origin                                       # Body origin
-        #P_M = twr.origin.locatenew('P_M', z_TM * fnd.frame.z) # Mooring      <<<< Measured from T
-        P_M = twr.origin                                       # Mooring (transfered to tower origin)
-        #P_M = twr.origin.locatenew('P_M', z_TM * fnd.frame.z) # <<<< Measured from T
-        #P_0 = twr.origin.locatenew('P_0', (-z_OT) * twr.frame.z) # 0- sea level <<<< Measured from T
-        P_0 = twr.origin.locatenew('P_0', (-z_OT) * fnd.frame.z) # 0- sea level <<<< Measured from T
-        P_M.v2pt_theory(twr.origin, ref.frame, twr.frame); # PM & T are fixed in e_T
-        P_0.v2pt_theory(twr.origin, ref.frame, twr.frame); # P0 & T are fixed in e_T
-
+        grav_F = (fnd.masscenter, fnd.mass * g_vect)
+        # Points of application for Buoyancy and mooring are only created if the loads are requested
         if opts['moor_loads']:
+            #P_M = twr.origin.locatenew('P_M', z_TM * fnd.frame.z) # Mooring      <<<< Measured from T
+            P_M = twr.origin                                       # Mooring (transfered to tower origin, velocity already known)
             #K_Mx, K_My, K_Mz          = symbols('K_x_M, K_y_M, K_z_M') # Mooring restoring
             #K_Mphix, K_Mphiy, K_Mphiz = symbols('K_phi_x_M, K_phi_y_M, K_phi_z_M') # Mooring restoring
             ### Restoring mooring and torques
@@ -473,12 +569,16 @@ def get_model(model_name, **opts):
             print('>>> Adding mooring loads')
 
         if opts['hydro_loads']:
+            P_O = twr.origin                                       # Body origin
+            #P_0 = twr.origin.locatenew('P_0', (-z_OT) * twr.frame.z) # 0- sea level <<<< Measured from T
+            P_0 = twr.origin.locatenew('P_0', (-z_OT) * fnd.frame.z) # 0- sea level <<<< Measured from T
+            P_0.v2pt_theory(twr.origin, ref.frame, twr.frame); # P0 & T are fixed in e_T
             # Hydro force
             #F_B = dynamicsymbols('F_B') # Buoyancy force
             F_hx, F_hy, F_hz = dynamicsymbols('F_hx, F_hy, F_hz') # Hydrodynamic force, function to time 
             M_hx, M_hy, M_hz = dynamicsymbols('M_hx, M_hy, M_hz') # Hydrodynamic moment, function to time 
-            fh = F_hx * ref.frame.x + F_hy * ref.frame.y + F_hz * ref.frame.z
-            Mh = M_hx * ref.frame.x + M_hy * ref.frame.y + M_hz * ref.frame.z
+            fh = F_hx * e_x + F_hy * e_y + F_hz * e_z
+            Mh = M_hx * e_x + M_hy * e_y + M_hz * e_z
             if model_name.find('hydroO')>1:
                 body_loads  += [(fnd, (P_O,  fh))] # NOTE: using P_O
                 print('>>> Adding hydro loads at Tower Origin')
@@ -504,12 +604,12 @@ def get_model(model_name, **opts):
 
     # --- Tower loads
     if twr is not None:
-        grav_T       = (twr.masscenter, -twr.mass * gravity * ref.frame.z)
+        grav_T       = (twr.masscenter, twr.mass * g_vect)
         body_loads  += [(twr,grav_T)]  
 
     # --- Nacelle loads
     if nac is not None:
-        grav_N = (nac.masscenter, -nac.mass * gravity * ref.frame.z)
+        grav_N = (nac.masscenter, nac.mass * g_vect)
         body_loads  += [(nac,grav_N)]  
 
 
@@ -521,13 +621,13 @@ def get_model(model_name, **opts):
         if bBld:
             # Gravity on blades
             for ib,bld in enumerate(blds):
-                grav_B       = (bld.masscenter, -bld.mass * gravity * ref.frame.z)
+                grav_B       = (bld.masscenter, bld.mass * g_vect)
                 body_loads  += [(bld,grav_B)]  
 
             print('>>>> TODO aero/misc loads on blades')
         else:
             # Rotor loads
-            grav_R = (rot.masscenter, -M_R * gravity * ref.frame.z)
+            grav_R = (rot.masscenter, M_R * g_vect)
             body_loads  += [(rot,grav_R)]  
 
             # NOTE: loads on rot, but expressed in N frame
@@ -551,14 +651,15 @@ def get_model(model_name, **opts):
     else:
         # RNA loads, point load at R
         R=Point('R')
-        R.set_pos(nac.origin, x_NR * nac.frame.x + z_NR* nac.frame.z)
-        R.set_vel(nac.frame, 0 * nac.frame.x)
+        n_x, n_y, n_z = nac.frame.x, nac.frame.y, nac.frame.z
+        R.set_pos(nac.origin, x_NR * n_x + z_NR* n_z)
+        R.set_vel(nac.frame, 0 * n_x)
         R.v2pt_theory(nac.origin, ref.frame, nac.frame)
         #thrustN = (nac.masscenter, T * nac.frame.x)
         if opts['tiltShaft']:
-            thrustN = (R, T_a *cos(tiltDOF) * nac.frame.x -T_a *sin(tiltDOF) * nac.frame.z)
+            thrustN = (R, T_a *cos(tiltDOF) * n_x -T_a *sin(tiltDOF) * n_z)
         else:
-            thrustN = (R, T_a * nac.frame.x )
+            thrustN = (R, T_a * n_x )
         if opts['aero_forces']:
             body_loads  += [(nac,thrustN)]
 
@@ -566,11 +667,11 @@ def get_model(model_name, **opts):
             print('>>> Adding aero torques 3')
             if opts['tiltShaft']:
                 # NOTE: for a rigid RNA we keep only M_y and M_z, no shaft torque
-                x_tilted = cos(tiltDOF) * nac.frame.x - sin(tiltDOF) * nac.frame.z
-                z_tilted = cos(tiltDOF) * nac.frame.y + sin(tiltDOF) * nac.frame.x
-                M_a_N = (nac.frame,                  M_ay*nac.frame.y + M_az*z_tilted) 
+                x_tilted = cos(tiltDOF) * n_x - sin(tiltDOF) * n_z
+                z_tilted = cos(tiltDOF) * n_y + sin(tiltDOF) * n_x
+                M_a_N = (nac.frame,                  M_ay*n_y + M_az*z_tilted) 
             else:
-                M_a_N = (nac.frame, M_ax*nac.frame.x +  M_ay*nac.frame.y  + M_az*nac.frame.z)
+                M_a_N = (nac.frame, M_ax*n_x +  M_ay*n_y  + M_az*n_z)
             body_loads  += [(nac, M_a_N)]  
     if verbose:
         print('>>> Loads:')
@@ -581,14 +682,10 @@ def get_model(model_name, **opts):
     # --- Kinematic equations 
     # --------------------------------------------------------------------------------{
     # --- Defining Body rotational velocities
-    if not bRotorOnly:
-        omega_TE = twr.ang_vel_in(ref)        # Angular velocity of nacelle in inertial frame
-        omega_NT = nac.ang_vel_in(twr.frame)  # Angular velocity of nacelle in inertial frame
-        if rot is not None:
-            omega_RN = rot.ang_vel_in(nac.frame)  # Angular velocity of rotor wrt Nacelle (omega_R-omega_N)
-    else:
-        # Rotor only
-        omega_RN = diff(q_psi, time) * ref.frame.x  # Angular velocity of rotor wrt Nacelle (omega_R-omega_N)
+    omega_TE = twr.ang_vel_in(ref)        # Angular velocity of nacelle in inertial frame
+    omega_NT = nac.ang_vel_in(twr.frame)  # Angular velocity of nacelle in inertial frame
+    if rot is not None:
+        omega_RN = rot.ang_vel_in(nac.frame)  # Angular velocity of rotor wrt Nacelle (omega_R-omega_N)
 
 
     kdeqsSubs =[]
@@ -605,8 +702,9 @@ def get_model(model_name, **opts):
         else:
             #print('>>>>>>>> TODO sort out which frame')
             #fndVelAll +=[ omega_TE.dot(ref.frame.x).simplify(), omega_TE.dot(ref.frame.y).simplify(), omega_TE.dot(ref.frame.z).simplify()]  
-            fndVelAll +=[ omega_TE.dot(twr.frame.x).simplify(), omega_TE.dot(twr.frame.y).simplify(), omega_TE.dot(twr.frame.z).simplify()]  
-        kdeqsSubs+=[ (fndSpeedsAll[i], fndVelAll[i]) for i,dof in enumerate(bFndDOFs) if dof] 
+            # Only the components of active rotational DOFs are computed, they are simplified by model.finalize()
+            fndVelAll +=[ omega_TE.dot(e) if active else None for active, e in zip(bFndDOFs[3:6], [twr.frame.x, twr.frame.y, twr.frame.z])]  
+        kdeqsSubs+=list(compress(zip(fndSpeedsAll, fndVelAll), bFndDOFs)) 
 
     # --- Twr
     if nDOF_twr>0:
@@ -621,18 +719,15 @@ def get_model(model_name, **opts):
             if nDOF_sft==1:
                 #print('>>>>>>>> TODO sort out which frame')
                 # I believe we should use omega_RE
-                if rot is None:
-                    kdeqsSubs+=[ (omega_x_R,  omega_RN.dot(ref.frame.x).simplify()) ]  
-                else:
-                    kdeqsSubs+=[ (omega_x_R,  omega_RN.dot(rot.frame.x).simplify()) ]  
+                kdeqsSubs+=[ (omega_x_R,  omega_RN.dot(rot.frame.x)) ]  
             if nDOF_bld>0:
-                for bld in blds:
+                for bld in (blds[:1] if opts['collectiveBldDOF'] else blds):
                     kdeqsSubs +=[ (bld.qd[i], bld.qdot[i]) for i,_ in enumerate(bld.q)]; 
         else:
             if nDOF_sft==1:
                 #print('>>>>>>>> TODO sort out which frame')
                 # I believe we should use omega_RE
-                kdeqsSubs+=[ (omega_x_R, omega_RN.dot(rot.frame.x).simplify()) ]  
+                kdeqsSubs+=[ (omega_x_R, omega_RN.dot(rot.frame.x)) ]  
 
     if verbose:
         print('>>> kdeqsSubs:', kdeqsSubs)
@@ -662,13 +757,8 @@ def get_model(model_name, **opts):
 
     # Small angles
     model.smallAnglesFnd    = [phi_x,phi_y,phi_z]
-    if nDOF_twr>0:
-        if opts['rot_elastic_smallAngle']:
-            model.smallAnglesTwr    = twr.vcList
-        else:
-            model.smallAnglesTwr    = []
-    else:
-        model.smallAnglesTwr    = []
+    # Elastic rotations of the tower, only for a flexible tower and if requested
+    model.smallAnglesTwr    = list(twr.vcList) if nDOF_twr>0 and opts['rot_elastic_smallAngle'] else []
 
     model.smallAnglesNac = []
     if opts['yaw']=='dynamic':
@@ -677,10 +767,7 @@ def get_model(model_name, **opts):
         model.smallAnglesNac += [q_tilt]
     model.smallAngles=model.smallAnglesFnd + model.smallAnglesTwr + model.smallAnglesNac
 
-    # Shape normalization
-    if nDOF_twr>0:
-        model.shapeNormSubs= [(v,1) for v in twr.ucList]
-    else:
-        model.shapeNormSubs= []
+    # Shape normalization (already computed by the flexible tower)
+    model.shapeNormSubs= list(twr.shapeNormSubs) if nDOF_twr>0 else []
 
     return model
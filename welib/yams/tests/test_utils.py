@@ -42,5 +42,19 @@ class TestUtils(unittest.TestCase):
         I_A2 = translateInertiaMatrixFromCOG(I_G,M, r_GA) # I@A from G
         np.testing.assert_equal(I_A,I_A2)
 
+    def test_transferLoadsZPoint(self):
+        # --- smallRot_OF transfer, compared to a transfer using the DCM at each time step
+        from welib.yams.rotations import smallRot_OF
+        phi_x = np.array([0, 0.1 , -0.2, 0.05])
+        phi_y = np.array([0, 0.02,  0.1, 0.3 ])
+        phi_z = np.array([0, -0.1,  0.0, 0.01])
+        ls = np.arange(24).reshape(6,4)*1.
+        z  = -10
+        ld = transferLoadsZPoint(ls, z, phi_x, phi_y, phi_z, rot_type='smallRot_OF')
+        for i in range(4):
+            r = smallRot_OF(phi_x[i], phi_y[i], phi_z[i]).T.dot([0,0,z])
+            np.testing.assert_almost_equal(ld[:3,i], ls[:3,i])
+            np.testing.assert_almost_equal(ld[3:,i], ls[3:,i] + np.cross(r, ls[:3,i]))
+
 if __name__=='__main__':
     unittest.main()
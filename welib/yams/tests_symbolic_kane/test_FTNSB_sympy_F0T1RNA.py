@@ -3,6 +3,8 @@ Analytical equation of motions for a wind turbine using 1 degree of freedom:
  - flexible fore-aft tower
 
 """ 
+import os
+import importlib.util
 import numpy as np
 import unittest
 
@@ -76,6 +78,48 @@ class TestF0T1RNA(unittest.TestCase):
 
         self.assertEqual(DFF,0)
 
+    def test_F0T1RNA_compile(self):
+        # Numerical mass matrix and forcing match the symbolic expressions
+        model=main(unittest=True)
+        MM = model.kane.mass_matrix_full
+        FF = model.kane.forcing_full
+        u_var = [dynamicsymbols('T_a'), dynamicsymbols('M_y_a')]
+        p_var = sorted((MM.free_symbols | FF.free_symbols) - {dynamicsymbols._t}, key=str)
+        with self.assertRaises(Exception):
+            model.compile_eom(p_var=p_var)
+        fM, fF = model.compile_eom(p_var=p_var, u_var=u_var)
+        x = np.linspace(0.1, 0.9, len(model.q_full)+len(p_var)+len(u_var))
+        subs = dict(zip(model.q_full+p_var+u_var, x))
+        np.testing.assert_almost_equal(fM(*x), np.array(MM.subs(subs), dtype=float))
+        np.testing.assert_almost_equal(fF(*x), np.array(FF.subs(subs), dtype=float))
+        # The common sub-expressions are computed once and shared by the mass matrix and forcing
+        common, reduced = model.cse()
+        self.assertIs(model.cse()[0], common)
+        self.assertEqual(MM, reduced[0].subs(list(reversed(common))))
+        import shutil
+        if shutil.which(os.environ.get('CC', 'cc')) is not None:
+            fM_c, fF_c = model.compile_eom(p_var=p_var, u_var=u_var, backend='c')
+            np.testing.assert_almost_equal(fM_c(*x), fM(*x))
+            np.testing.assert_almost_equal(fF_c(*x), fF(*x))
+            # Compiler errors are reported
+            from welib.yams.yams_sympy_model import _compileC
+            with self.assertRaisesRegex(Exception, 'failed'):
+                _compileC(model.q_full, [MM], ['1MM'])
+
+    @unittest.skipUnless(importlib.util.find_spec('numba') is not None, 'numba not available')
+    def test_F0T1RNA_compile_numba(self):
+        # Functions compiled with numba match the numpy ones
+        model=main(unittest=True)
+        MM = model.kane.mass_matrix_full
+        FF = model.kane.forcing_full
+        u_var = [dynamicsymbols('T_a'), dynamicsymbols('M_y_a')]
+        p_var = sorted((MM.free_symbols | FF.free_symbols) - {dynamicsymbols._t}, key=str)
+        fM, fF = model.compile_eom(p_var=p_var, u_var=u_var)
+        fM_n, fF_n = model.compile_eom(p_var=p_var, u_var=u_var, backend='numba')
+        x = np.linspace(0.1, 0.9, len(model.q_full)+len(p_var)+len(u_var))
+        np.testing.assert_almost_equal(fM_n(*x), fM(*x))
+        np.testing.assert_almost_equal(fF_n(*x), fF(*x))
+
 
 
 if __name__=='__main__':
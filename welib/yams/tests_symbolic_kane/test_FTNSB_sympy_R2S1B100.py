@@ -0,0 +1,46 @@
+""" 
+Analytical equation of motions for a two-bladed rotor with flexible blades:
+ - rotor azimuth
+ - first flap mode of each blade
+
+""" 
+import numpy as np
+import unittest
+
+from sympy import Symbol, simplify, zeros
+from sympy.parsing.sympy_parser import parse_expr
+from welib.yams.models.FTNSB_sympy import get_model
+from welib.yams.models.FTNSB_sympy_symbols import *
+
+def main(unittest=False):
+
+    model = get_model('R2S1B100')
+    model.kaneEquations(Mform='TaylorExpanded')
+
+    return model
+
+def _noCaret(expr):
+    # Taylor symbols (e.g. M_e^0_B_11) cannot be parsed, remove the caret from their names
+    return expr.xreplace({s:Symbol(s.name.replace('^','')) for s in expr.free_symbols if isinstance(s, Symbol)})
+
+
+class TestR2S1B100(unittest.TestCase):
+    def test_R2S1B100(self):
+        # Test expression of mass and forcing against the reference output of the model
+        model=main(unittest=True)
+        subs = model.shapeNormSubs + [(theta_pitch,0),(theta_cone,0),(psi_0,0)]
+
+        # --- Mass matrix
+        MM     = _noCaret(model.kane.mass_matrix.subs(subs))
+        MM_ref = parse_expr('Matrix([[2*J0_B_xx + J1_1_B_xx*q_B11(t) + J1_1_B_xx*q_B21(t) + 2*M_B*r_h**2 - 4*M_d0_B_z*r_h - 2*M_d1_1_B_z*r_h*q_B11(t) - 2*M_d1_1_B_z*r_h*q_B21(t), C_r0_B_1x + C_r1_1_B_1x*q_B11(t) - r_h*(C_t0_B_1y + C_t1_1_B_1y*q_B11(t)), C_r0_B_1x + C_r1_1_B_1x*q_B21(t) - r_h*(C_t0_B_1y + C_t1_1_B_1y*q_B21(t))], [C_r0_B_1x + C_r1_1_B_1x*q_B11(t) - r_h*(C_t0_B_1y + C_t1_1_B_1y*q_B11(t)), M_e0_B_11 + M_e1_1_B_11*q_B11(t), 0], [C_r0_B_1x + C_r1_1_B_1x*q_B21(t) - r_h*(C_t0_B_1y + C_t1_1_B_1y*q_B21(t)), 0, M_e0_B_11 + M_e1_1_B_11*q_B21(t)]])')
+        self.assertEqual((MM-MM_ref).applyfunc(simplify), zeros(3,3))
+
+        # --- Forcing
+        FF     = _noCaret(model.kane.forcing.subs(subs))
+        FF_ref = parse_expr('Matrix([[-2*C_t0_B_1z*r_h*omega_x_R(t)*qd_B11(t) - 2*C_t0_B_1z*r_h*omega_x_R(t)*qd_B21(t) - 2*C_t1_1_B_1z*r_h*omega_x_R(t)*q_B11(t)*qd_B11(t) - 2*C_t1_1_B_1z*r_h*omega_x_R(t)*q_B21(t)*qd_B21(t) - G_r_10_B_xx*omega_x_R(t)*qd_B11(t) - G_r_10_B_xx*omega_x_R(t)*qd_B21(t) - G_r_11_1_B_xx*omega_x_R(t)*q_B11(t)*qd_B11(t) - G_r_11_1_B_xx*omega_x_R(t)*q_B21(t)*qd_B21(t) + M_d1_1_B_y*g*q_B11(t)*cos(psi(t)) - M_d1_1_B_y*g*q_B21(t)*cos(psi(t)) - M_d1_1_B_z*g*q_B11(t)*sin(psi(t)) + M_d1_1_B_z*g*q_B21(t)*sin(psi(t))], [-D_e0_B_11*qd_B11(t) - K_e0_B_11*q_B11(t) - g*(C_t0_B_1y + C_t1_1_B_1y*q_B11(t))*sin(psi(t)) - (C_t0_B_1z + C_t1_1_B_1z*q_B11(t))*(g*cos(psi(t)) - r_h*omega_x_R(t)**2) - (G_e_10_B_1x + G_e_11_1_B_1x*q_B11(t))*omega_x_R(t)*qd_B11(t) - (O_e0_B_1xx + O_e1_1_B_1xx*q_B11(t))*omega_x_R(t)**2], [-D_e0_B_11*qd_B21(t) - K_e0_B_11*q_B21(t) + g*(C_t0_B_1y + C_t1_1_B_1y*q_B21(t))*sin(psi(t)) + (C_t0_B_1z + C_t1_1_B_1z*q_B21(t))*(g*cos(psi(t)) + r_h*omega_x_R(t)**2) - (G_e_10_B_1x + G_e_11_1_B_1x*q_B21(t))*omega_x_R(t)*qd_B21(t) - (O_e0_B_1xx + O_e1_1_B_1xx*q_B21(t))*omega_x_R(t)**2]])')
+        self.assertEqual((FF-FF_ref).applyfunc(simplify), zeros(3,1))
+
+
+if __name__=='__main__':
+    np.set_printoptions(linewidth=500)
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+
+from welib.yams.yams_sympy import YAMSFlexibleBody
+
+# --------------------------------------------------------------------------------}
+# --- TESTS
+# --------------------------------------------------------------------------------{
+class Test(unittest.TestCase):
+    def test_flexible_clone(self):
+        # A cloned body has the same inertial variables, but its own name and DOFs
+        B1 = YAMSFlexibleBody('B1', 2, directions=['x','y'], name_for_var='B')
+        B2 = B1.clone('B2')
+        B3 = YAMSFlexibleBody('B2', 2, directions=['x','y'], name_for_var='B')
+        self.assertEqual(B2.name, 'B2')
+        self.assertEqual(B2.q, B3.q)
+        self.assertEqual(B2.alphaSubs, B3.alphaSubs)
+        self.assertEqual(B2.Me.eval(B2.q), B3.Me.eval(B3.q))
+        self.assertEqual(str(B2.frame), str(B3.frame))
+        # Taylor matrices are copies
+        B2.J.M0[0,1] = 0
+        self.assertNotEqual(B1.J.M0[0,1], 0)
+        # Collective DOFs, the body mass matrix is shared
+        B4 = B1.clone('B4', name_for_DOF='B1')
+        self.assertEqual(B4.q, B1.q)
+        self.assertEqual(B4.frame.name, 'e_B4')
+        MM1 = B1.bodyMassMatrix()
+        self.assertEqual(len(B4._MMcache), 1)
+        self.assertEqual(B4.bodyMassMatrix(), MM1)
+        # Clones with the same DOFs are independent of the body
+        self.assertIsNot(B4.Me, B1.Me)
+        self.assertIsNot(B4.alphaSubs, B1.alphaSubs)
+        self.assertIsNot(B4.shapeNormSubs, B1.shapeNormSubs)
+        B4.shapeNormSubs.append(('dummy', 0))
+        self.assertEqual(len(B1.shapeNormSubs), 2)
+        # Modifications of the body after a first call are accounted for
+        B1.mass = 2*B1.mass
+        B1.Me.M0[0,0] = 0
+        MM2 = B1.bodyMassMatrix()
+        self.assertEqual(MM2[0,0], 2*MM1[0,0])
+        self.assertNotEqual(MM2[6,6], MM1[6,6])
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -143,6 +143,16 @@ class Test(unittest.TestCase):
 
 
 
+    def test_rigid_clone(self):
+        # A cloned body has the same inertial variables, but its own name and frame
+        B1 = YAMSRigidBody('B1', rho_G = symbols('x_G, y_G, z_G'), name_for_var='B', J_form='cross')
+        B2 = B1.clone('B2')
+        self.assertEqual(B2.name, 'B2')
+        self.assertEqual(B2.mass, B1.mass)
+        self.assertEqual(B2.inertia[0].to_matrix(B2.frame), B1.inertia[0].to_matrix(B1.frame))
+        self.assertEqual(B2.masscenter.pos_from(B2.origin).to_matrix(B2.frame), B1.masscenter.pos_from(B1.origin).to_matrix(B1.frame))
+        self.assertIsNot(B2.frame, B1.frame)
+
 
 if __name__=='__main__':
     unittest.main()
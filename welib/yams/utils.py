@@ -228,11 +228,22 @@ def transferLoadsZPoint(ls, z, phi_x, phi_y, phi_z, rot_type='default'):
         r = (  z*np.sin(phi_y) , -z * np.sin(phi_x) * np.cos(phi_y),  z *np.cos(phi_x)* np.cos(phi_y))
 
     elif rot_type=='smallRot_OF':
-        #  smallRot_OF.T .dot(s_b)
+        #  smallRot_OF.T .dot(s_b) = z * (third row of smallRot_OF), vectorized over time
+        phi_x = np.asarray(phi_x); phi_y = np.asarray(phi_y); phi_z = np.asarray(phi_z)
+        LrgAngle  = 0.4 # See smallRot_OF
+        if np.any(np.abs(phi_x)>LrgAngle) or np.any(np.abs(phi_y)>LrgAngle) or np.any(np.abs(phi_z)>LrgAngle):
+            raise Exception('Small angle assumption violated in transferLoadsZPoint due to a large rotation')
+        SqrdSum      = phi_x**2 + phi_y**2 + phi_z**2
+        SQRT1SqrdSum = np.sqrt(1. + SqrdSum)
+        ComDenom     = SqrdSum*SQRT1SqrdSum
+        bZero        = ComDenom==0
+        ComDenom[bZero] = 1
         r = np.zeros((3,len(phi_z)))
-        for i,(phi_x1,phi_y1, phi_z1) in enumerate(zip(phi_x,phi_y,phi_z)):
-            R_b2g = smallRot_OF(phi_x1, phi_y1, phi_z1).T
-            r[:,i] = R_b2g.dot(s_b)
+        r[0] = (  phi_y*SqrdSum + phi_x*phi_z*(SQRT1SqrdSum - 1.) )/ComDenom
+        r[1] = ( -phi_x*SqrdSum + phi_y*phi_z*(SQRT1SqrdSum - 1.) )/ComDenom
+        r[2] = ( phi_x**2 + phi_y**2 + phi_z**2*SQRT1SqrdSum )/ComDenom
+        r[:,bZero] = np.array([0.,0.,1.])[:,None]
+        r *= z
 
     elif rot_type=='smallRot':
         #  smallRot_A .dot(s_b)
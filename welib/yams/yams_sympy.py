@@ -8,10 +8,11 @@ NOTE: this file is intended to be comparable with yams.py
 Reference:
      [1]: Branlard, Flexible multibody dynamics using joint coordinates and the Rayleigh-Ritz approximation: the general framework behind and beyond Flex, Wind Energy, 2019
 """
+import copy
 import numpy as np
 import sympy
 from sympy import Symbol, symbols
-from sympy import Matrix, Function, diff
+from sympy import Matrix, ImmutableMatrix, Function, diff
 from sympy.printing import lambdarepr
 from sympy import init_printing
 from sympy import lambdify
@@ -193,6 +194,14 @@ class Taylor(object):
         else:
             raise Exception('set order for now mainly removes the 2nd order term')
 
+    def copy(self):
+        """ copy of the Taylor expansion, the matrices are copied, the symbols are shared """
+        T = copy.copy(self)
+        T.M0 = self.M0.copy()
+        if hasattr(self,'M1'): 
+            T.M1 = [M1.copy() for M1 in self.M1]
+        return T
+
 #Me = Taylor('T','Me', 3, 3, nq=2, rname='xyz', cname='xyz')
 #Me.M1
 #Me.eval([x,y])
@@ -990,6 +999,21 @@ class YAMSRigidBody(YAMSBody,SympyRigidBody):
 
         # For harmony with flexible bodies
         self.shapeNormSubs= []
+
+    def clone(self, name):
+        """ 
+        Return an unconnected copy of the body with a new name (frame and points).
+        The mass, inertia and COG coordinates are reused, no new variables are introduced.
+        Typically used for identical blades.
+        """
+        if self.parent is not None or len(self.children)>0:
+            raise Exception('Only unconnected bodies can be cloned, clone body {} before connecting it'.format(self.name))
+        J, P = self.inertia
+        e = self.frame
+        B = YAMSRigidBody(name, mass=self.mass, J_G=J.to_matrix(e), rho_G=[self.s_G_inB.dot(e.x), self.s_G_inB.dot(e.y), self.s_G_inB.dot(e.z)], 
+                J_form='full', J_at_Origin=P is self.origin)
+        B.viz_opts = self.viz_opts.copy()
+        return B
             
     def inertiaIsInPrincipalAxes(self):
         """ enforce the fact that the frame is along the principal axes"""
@@ -1111,16 +1135,7 @@ class YAMSFlexibleBody(YAMSBody):
         self.name_for_var = name_for_var
         self.name_for_DOF = name_for_DOF
         self.L     = symbols('L_'+name_for_var)
-        self.q     = []                         # DOF
-        self.qd    = []                         # DOF velocity as "anonymous" variables
-        self.qdot  = []                         # DOF velocities
-        self.qddot = []                         # DOF accelerations
-        t=dynamicsymbols._t
-        for i in np.arange(nq):
-            self.q.append   (dynamicsymbols('q_{}{}'. format(name_for_DOF,i+1)))
-            self.qd.append  (dynamicsymbols('qd_{}{}'.format(name_for_DOF,i+1)))
-            self.qdot.append(diff(self.q[i],t))
-            self.qddot.append(diff(self.qdot[i],t))
+        self.defineDOFs(nq)
         # --- Mass matrix related
         self.mass=symbols('M_{}'.format(name_for_var))
         self.J   = Taylor(name_for_var,'J'  , 3 , 3 , nq=nq, rname='xyz', cname='xyz', order=orderMM)
@@ -1153,6 +1168,7 @@ class YAMSFlexibleBody(YAMSBody):
 
         self.predefined_kind=predefined_kind
         self.applyKindSimplification()
+        self._MMcache = {} # Mass matrices M'(q), keyed on the inertial terms, shared with clones
  
     def __repr__(self):
         # YAMS Flexible body
@@ -1172,6 +1188,44 @@ class YAMSFlexibleBody(YAMSBody):
         return s
 
 
+    def defineDOFs(self, nq):
+        self.q     = []                         # DOF
+        self.qd    = []                         # DOF velocity as "anonymous" variables
+        self.qdot  = []                         # DOF velocities
+        self.qddot = []                         # DOF accelerations
+        t=dynamicsymbols._t
+        for i in np.arange(nq):
+            self.q.append   (dynamicsymbols('q_{}{}'. format(self.name_for_DOF,i+1)))
+            self.qd.append  (dynamicsymbols('qd_{}{}'.format(self.name_for_DOF,i+1)))
+            self.qdot.append(diff(self.q[i],t))
+            self.qddot.append(diff(self.qdot[i],t))
+
+    def clone(self, name, name_for_DOF=None):
+        """ 
+        Return an unconnected copy of the body, with a new name and new DOFs (name_for_DOF).
+        The inertial variables (name_for_var) and their Taylor expansions are copied, not recomputed.
+        The clone is independent of the body, only the cache of the body mass matrix is shared 
+        (e.g. computed once for collective blade DOFs).
+        Typically used for identical blades.
+        """
+        if self.parent is not None or len(self.children)>0:
+            raise Exception('Only unconnected bodies can be cloned, clone body {} before connecting it'.format(self.name))
+        if name_for_DOF is None:
+            name_for_DOF=name
+        B = copy.copy(self)
+        YAMSBody.__init__(B, name)
+        B.masscenter.set_pos(B.origin, 0*B.frame.x)
+        B.name_for_DOF = name_for_DOF
+        for k in ['J', 'Ct', 'Cr', 'Me', 'mdCM', 'Oe', 'Ke', 'De']:
+            setattr(B, k, getattr(self, k).copy())
+        B.Gr = [T.copy() for T in self.Gr]
+        B.Ge = [T.copy() for T in self.Ge]
+        B.directions = copy.copy(self.directions)
+        B.defineDOFs(len(self.q))
+        B.defineExtremity(B.directions)
+        B.shapeNormSubs= [(v,1) for v in B.ucList]
+        return B
+
     def defineExtremity(self, directions=None): 
         if directions is None:
             directions=['xyz']*len(self.q)
@@ -1211,6 +1265,15 @@ class YAMSFlexibleBody(YAMSBody):
         self.ucList =uList # "PhiU" values at connection point for each mode
         self.vcList =vList # "PhiV" valaes at connection point for each mode
 
+    def _MMkey(self, form, q):
+        """ 
+        Key for the cache of the body mass matrix, it contains the values of all the terms the mass 
+        matrix depends on, such that modifications of the body (e.g. mass, Taylor matrices) are accounted for
+        """
+        taylors = [self.J, self.Ct, self.Cr, self.Me, self.mdCM]
+        return (form, tuple(q), self.mass, self.predefined_kind, tuple(self.directions or []),
+                tuple((ImmutableMatrix(T.M0),) + tuple(ImmutableMatrix(M1) for M1 in getattr(T, 'M1', [])) for T in taylors))
+
     def bodyMassMatrix(self, q=None, form='TaylorExpanded', order=None, dof=None):
         """ Body mass matrix in body coordinates M'(q)
         form is ['symbolic' , 'TaylorExpanded']
@@ -1221,6 +1284,12 @@ class YAMSFlexibleBody(YAMSBody):
         else:
             if len(q)!=len(self.q):
                 raise Exception('Inconsistent dimension between q ({}) and body nq ({}) for body {}'.format(len(q),nq,self.name))
+        key = None
+        if order is None and dof is None:
+            key = self._MMkey(form, q)
+            if key in self._MMcache:
+                self.M = self._MMcache[key].copy()
+                return self.M
         self.M=zeros(6+nq,6+nq)
         # Mxx
         self.M[0,0] = self.mass
@@ -1346,6 +1415,8 @@ class YAMSFlexibleBody(YAMSBody):
             else:
                 raise NotImplementedError()
         
+        if key is not None:
+            self._MMcache[key] = self.M.copy()
         return self.M
     
     def bodyQuadraticForce(self, omega, q, qd, form='TaylorExpanded'):
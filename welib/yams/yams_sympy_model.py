@@ -12,6 +12,86 @@ from .yams_kane import YAMSKanesMethod
 from .yams_sympy import YAMSFlexibleBody
 from welib.tools.tictoc import Timer
 from collections import OrderedDict
+from functools import lru_cache
+
+@lru_cache(maxsize=1024)
+def _cached_simplify(expr):
+    """ 
+    Simplify an expression. Sympy expressions hash and compare on their structure, 
+    so identical expressions (e.g. angular velocities of repeated models) are simplified once.
+    The cache is bounded, to limit memory use over long sessions (e.g. parameter sweeps).
+    """
+    return sp.simplify(expr)
+
+# --------------------------------------------------------------------------------}
+# --- Code generation
+# --------------------------------------------------------------------------------{
+def _cseSubset(common, expr):
+    """ Return the common sub-expressions (in order) needed to evaluate `expr` """
+    needed = set(expr.free_symbols)
+    subset = []
+    for v, e in reversed(common):
+        if v in needed:
+            subset.append((v, e))
+            needed |= e.free_symbols
+    return subset[::-1]
+
+def _compileC(args, mats, names, folder=None, cses=None):
+    """ 
+    Generate C functions `void name(const double *x, double *out)` for a list of sympy matrices,
+    function of the symbols `args`=x, compile them into a shared library and load them with ctypes.
+    Common sub-expressions are eliminated, unless they are provided: cses[i] is then the list of 
+    (symbol, expression) needed by mats[i].
+    The files are written in `folder`, or in a temporary folder, deleted with the returned functions.
+    The compiler is given by the environment variable CC (default: cc).
+    Returns python functions f(*args) returning numpy arrays of the shape of the matrices.
+    """
+    import ctypes
+    import subprocess
+    import tempfile
+    x = sp.IndexedBase('x', shape=(len(args),))
+    xSubs = {a: x[i] for i,a in enumerate(args)}
+    code = ['#include <math.h>', '']
+    for im, (M, name) in enumerate(zip(mats, names)):
+        if cses is None:
+            reps, reduced = sp.cse(M.xreplace(xSubs))
+            reduced = reduced[0]
+        else:
+            reps    = [(v, e.xreplace(xSubs)) for v, e in cses[im]]
+            reduced = M.xreplace(xSubs)
+        code+= ['void {}(const double *x, double *out) {{'.format(name)]
+        code+= ['    const double {} = {};'.format(v, sp.ccode(e)) for v, e in reps]
+        code+= ['    out[{}] = {};'.format(i, sp.ccode(e)) for i, e in enumerate(reduced)]
+        code+= ['}', '']
+    tmpDir = None
+    if folder is None:
+        tmpDir = tempfile.TemporaryDirectory(prefix='yams_')
+        folder = tmpDir.name
+    srcFile = os.path.join(folder, 'yams_eom.c')
+    libFile = os.path.join(folder, 'yams_eom.so')
+    with open(srcFile, 'w') as f:
+        f.write('\n'.join(code))
+    cc = os.environ.get('CC', 'cc')
+    try:
+        subprocess.run([cc, '-O2', '-shared', '-fPIC', '-o', libFile, srcFile, '-lm'], check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        raise Exception('Compilation of {} with {} failed:\n{}'.format(srcFile, cc, e.stderr))
+    lib = ctypes.CDLL(libFile)
+
+    def wrap(cfun, shape):
+        cfun.argtypes = [np.ctypeslib.ndpointer(np.float64, flags='C_CONTIGUOUS')]*2
+        cfun.restype  = None
+        def f(*a):
+            out = np.empty(shape)
+            cfun(np.ascontiguousarray(a, dtype=np.float64), out)
+            return out
+        # NOTE: the functions keep the library and its temporary folder alive
+        f.lib    = lib
+        f.tmpDir = tmpDir
+        return f
+    return [wrap(getattr(lib, name), M.shape) for M, name in zip(mats, names)]
+
+
 # --------------------------------------------------------------------------------}
 # ---  
 # --------------------------------------------------------------------------------{
@@ -50,6 +130,9 @@ class YAMSModel(object):
         self.opts        = opts
         # Generated / Internal data
         self.kane        = None
+        self._finalized  = False
+        self.cse_common  = None # Common sub-expressions of the equations of motion, see `cse`
+        self.cse_reduced = None
         self._sa_forcing     = None
         self._sa_mass_matrix = None
         self._sa_M           = None
@@ -126,6 +209,16 @@ class YAMSModel(object):
         self.PointsFrames.append(frame)
 
 
+    def finalize(self):
+        """ 
+        Simplify the kinematic equations in one pass, once all of them have been gathered.
+        Models may provide unsimplified expressions in kdeqsSubs. Called by kaneEquations.
+        """
+        if not getattr(self, '_finalized', False):
+            self.kdeqsSubs = [(s, _cached_simplify(v.doit())) for (s,v) in self.kdeqsSubs]
+            self._finalized = True
+        return self
+
     def kaneEquations(self, Mform='symbolic', addGravity=True):
         """ 
         Compute equation of motions using Kane's method
@@ -138,6 +231,7 @@ class YAMSModel(object):
         for sa in ['ref', 'coordinates', 'speeds','kdeqs','bodies','loads']:
             if getattr(self,sa) is None:
                 raise Exception('Attribute {} needs to be set before calling `kane` method'.format(sa))
+        self.finalize()
 
         with Timer('Kane step1',True,silent=True):
             self.kane = YAMSKanesMethod(self.ref.frame, self.coordinates, self.speeds, self.kdeqs)
@@ -148,6 +242,21 @@ class YAMSModel(object):
             self.fr, self.frstar  = self.kane.kanes_equations(self.bodies, self.loads, Mform=Mform, addGravity=addGravity, g_vect=self.g_vect)
         self.kane.fr     = self.fr
         self.kane.frstar = self.frstar
+        self.cse_common  = None
+        self.cse_reduced = None
+
+    def cse(self):
+        """ 
+        Common sub-expressions of the full mass matrix and forcing of Kane's equations, computed once
+        and shared between the two, such that all code generations use the same factored form:
+            cse_common : list of (symbol, expression)
+            cse_reduced: [MM, FF] expressed with the symbols of cse_common
+        """
+        if self.kane is None:
+            raise Exception('Run `kaneEquations` before calling `cse`')
+        if getattr(self, 'cse_reduced', None) is None:
+            self.cse_common, self.cse_reduced = sp.cse([self.kane.mass_matrix_full, self.kane.forcing_full])
+        return self.cse_common, self.cse_reduced
 
     @property
     def q_full(self):
@@ -225,6 +334,47 @@ class YAMSModel(object):
         return y
 
 
+    def compile_eom(self, p_var=None, u_var=None, backend='numpy'):
+        """ 
+        Return numerical functions for the full mass matrix and forcing vector of Kane's equations:
+            MM = fM(*q, *qd, *p, *u)   and   FF = fF(*q, *qd, *p, *u)
+        where q are the coordinates, qd the speeds, p the parameters and u the inputs.
+        The common sub-expressions of the model are used (see `cse`).
+
+        p_var: list of symbols of the parameters, all the free symbols need to be provided
+        u_var: list of dynamic symbols of the inputs (e.g. time varying loads)
+        backend: 
+            - 'numpy': python code using numpy
+            - 'numba': numpy code compiled with numba.njit (optional dependency)
+            - 'c': C code compiled with the system compiler (environment variable CC, or cc) and loaded with ctypes
+        """
+        if self.kane is None:
+            raise Exception('Run `kaneEquations` before calling `compile_eom`')
+        p_var = [] if p_var is None else list(p_var)
+        u_var = [] if u_var is None else list(u_var)
+        args  = self.q_full + p_var + u_var
+        MM = self.kane.mass_matrix_full
+        FF = self.kane.forcing_full
+        missing = (MM.free_symbols | FF.free_symbols) - set(args) - {dynamicsymbols._t}
+        missing|= (find_dynamicsymbols(MM) | find_dynamicsymbols(FF)) - set(args)
+        if len(missing)>0:
+            raise Exception('The following symbols need to be provided in p_var or u_var: {}'.format(sorted([str(s) for s in missing])))
+        common, (MMr, FFr) = self.cse()
+        cses = [_cseSubset(common, MMr), _cseSubset(common, FFr)]
+        if backend=='c':
+            return _compileC(args, [MMr, FFr], ['MM', 'FF'], cses=cses)
+        if backend=='numba':
+            # Constant entries as floats, numba cannot build arrays from lists mixing integers and floats
+            MMr, FFr = [M.applyfunc(lambda v: sp.Float(v) if v.is_Number else v) for M in (MMr, FFr)]
+        fM = sp.lambdify(args, MMr, modules='numpy', cse=lambda e: (cses[0], e))
+        fF = sp.lambdify(args, FFr, modules='numpy', cse=lambda e: (cses[1], e))
+        if backend=='numba':
+            from numba import njit
+            fM, fF = njit(fM), njit(fF)
+        elif backend!='numpy':
+            raise NotImplementedError('Backend {}'.format(backend))
+        return fM, fF
+
     def getScene(self, y=None, rp=0.1, al=1, axes=True, origins=True):
         from pydy.viz.shapes import Cylinder, Sphere
         from pydy.viz.visualization_frame import VisualizationFrame